@@ -1,5 +1,6 @@
 """API routes for the Obsidian Web Reader."""
 
+import asyncio
 import logging
 import secrets
 from datetime import timedelta
@@ -167,7 +168,9 @@ async def select_vault(
     vault = vault_manager.get_vault(request.vault_id)
     if vault:
         try:
-            search_service.build_index(request.vault_id, vault.vault_path)
+            await asyncio.to_thread(
+                search_service.build_index, request.vault_id, vault.vault_path
+            )
         except Exception as e:
             logger.warning(f"Failed to build search index: {e}")
 
@@ -258,6 +261,16 @@ async def sync_vault(
     The vault must have been created from a git repository with stored credentials.
     """
     result = await vault_manager.sync_vault(vault_id)
+
+    # Bring the search index up to date with the pulled changes
+    vault = vault_manager.get_vault(vault_id) if result["success"] else None
+    if vault:
+        try:
+            # Parsing changed notes is blocking work; keep the event loop free
+            await asyncio.to_thread(search_service.update_index, vault_id, vault.vault_path)
+        except Exception as e:
+            logger.warning(f"Failed to update search index: {e}")
+
     return VaultSyncResponse(
         vault_id=vault_id,
         success=result["success"],
@@ -385,7 +398,12 @@ async def reindex_search(session_id: AuthSession) -> MessageResponse:
         )
 
     try:
-        count = search_service.build_index(vault.vault_id, vault.vault_path)
+        # Rebuilding parses every note; keep the event loop free
+        count = await asyncio.to_thread(
+            search_service.build_index, vault.vault_id, vault.vault_path
+        )
+        vault.invalidate_note_count()
+        vault_manager.invalidate_vault_list()
         return MessageResponse(message=f"Indexed {count} notes")
     except Exception as e:
         logger.error(f"Failed to reindex: {e}")
@@ -35,6 +35,11 @@ class Settings(BaseSettings):
         default=False,
         description="Set cookies with Secure flag (requires HTTPS). Set to true if using HTTPS directly.",
     )
+    max_sessions: int = Field(
+        default=10_000,
+        ge=1,
+        description="Maximum number of sessions whose active vault is remembered",
+    )
 
     # Vault configuration
     vaults_config: Path = Field(
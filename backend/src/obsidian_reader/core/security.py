@@ -4,6 +4,7 @@ import base64
 import hashlib
 import logging
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 import jwt
 from cryptography.fernet import Fernet, InvalidToken
@@ -15,18 +16,29 @@ logger = logging.getLogger(__name__)
 
 ALGORITHM = "HS256"
 
+# Number of distinct decrypted tokens kept in memory
+DECRYPT_CACHE_SIZE = 128
 
-def _get_encryption_key() -> bytes:
+
+def _get_encryption_key(secret_key: str | None = None) -> bytes:
     """Derive a Fernet-compatible encryption key from the secret key.
 
     Fernet requires a 32-byte base64-encoded key. We derive it from
-    the application's secret key using SHA-256.
+    the application's secret key (or the one given) using SHA-256.
     """
+    if secret_key is None:
+        secret_key = settings.secret_key
     # Use SHA-256 to get a consistent 32-byte key from the secret
-    key_bytes = hashlib.sha256(settings.secret_key.encode()).digest()
+    key_bytes = hashlib.sha256(secret_key.encode()).digest()
     return base64.urlsafe_b64encode(key_bytes)
 
 
+@lru_cache(maxsize=4)
+def _get_fernet(secret_key: str) -> Fernet:
+    """Get the Fernet instance for a secret key, built once per key."""
+    return Fernet(_get_encryption_key(secret_key))
+
+
 def encrypt_token(token: str) -> str:
     """Encrypt a token (e.g., GitHub deploy token) using Fernet.
 
@@ -38,8 +50,7 @@ def encrypt_token(token: str) -> str:
     """
     if not token:
         return ""
-    fernet = Fernet(_get_encryption_key())
-    encrypted = fernet.encrypt(token.encode())
+    encrypted = _get_fernet(settings.secret_key).encrypt(token.encode())
     return encrypted.decode()
 
 
@@ -55,9 +66,7 @@ def decrypt_token(encrypted_token: str) -> str | None:
     if not encrypted_token:
         return None
     try:
-        fernet = Fernet(_get_encryption_key())
-        decrypted = fernet.decrypt(encrypted_token.encode())
-        return decrypted.decode()
+        return _decrypt_cached(settings.secret_key, encrypted_token)
     except InvalidToken:
         logger.warning("Failed to decrypt token - invalid or corrupted")
         return None
@@ -66,6 +75,16 @@ def decrypt_token(encrypted_token: str) -> str | None:
         return None
 
 
+@lru_cache(maxsize=DECRYPT_CACHE_SIZE)
+def _decrypt_cached(secret_key: str, encrypted_token: str) -> str:
+    """Decrypt a token, memoized per secret key and ciphertext.
+
+    Scheduled syncs decrypt the same stored token on every run. Failures
+    raise and are therefore never cached.
+    """
+    return _get_fernet(secret_key).decrypt(encrypted_token.encode()).decode()
+
+
 class TokenData(BaseModel):
     """Data stored in JWT token."""
 
@@ -39,21 +39,25 @@ async def startup_event():
     # Ensure data directory exists
     settings.data_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize vault manager
+    # Initialize vault manager, giving the scheduler access to its configs
+    from .services.scheduler import vault_scheduler
     from .services.vault_manager import vault_manager
 
+    vault_scheduler.set_vault_manager(vault_manager)
     await vault_manager.initialize()
 
     # Build search indexes for all vaults
     from .services.search import search_service
 
+    vault_paths = {}
     for vault_info in vault_manager.list_vaults():
         vault = vault_manager.get_vault(vault_info.id)
         if vault:
-            try:
-                search_service.build_index(vault_info.id, vault.vault_path)
-            except Exception as e:
-                logging.warning(f"Failed to build search index for {vault_info.id}: {e}")
+            vault_paths[vault_info.id] = vault.vault_path
+    try:
+        search_service.build_indexes(vault_paths)
+    except Exception as e:
+        logging.warning(f"Failed to build search indexes: {e}")
 
 
 # Include API routes
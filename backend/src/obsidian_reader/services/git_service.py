@@ -11,6 +11,9 @@ from git.exc import NoSuchPathError
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in a repository folder name
+_REPO_NAME_UNSAFE_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
 
 class GitServiceError(Exception):
     """Base exception for git service errors."""
@@ -70,7 +73,7 @@ class GitService:
         repo_name = path.split("/")[-1] if "/" in path else path
 
         # Sanitize: only allow alphanumeric, hyphen, underscore
-        sanitized = re.sub(r"[^a-zA-Z0-9_-]", "-", repo_name)
+        sanitized = _REPO_NAME_UNSAFE_RE.sub("-", repo_name)
 
         return sanitized.lower()
 
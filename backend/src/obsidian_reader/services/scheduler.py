@@ -9,6 +9,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from ..core.security import decrypt_token
 from .git_service import GitAuthenticationError, GitRepositoryError, git_service
+from .search import search_service
 
 if TYPE_CHECKING:
     from .vault_manager import VaultManager
@@ -64,7 +65,7 @@ class VaultScheduler:
 
         # Add new job
         self._scheduler.add_job(
-            func=self._sync_vault,
+            func=self._run_scheduled_sync,
             trigger=IntervalTrigger(minutes=interval_minutes),
             id=job_id,
             args=[vault_id, vault_path, encrypted_token],
@@ -104,6 +105,25 @@ class VaultScheduler:
         """
         return self._sync_vault(vault_id, vault_path, encrypted_token)
 
+    def _run_scheduled_sync(
+        self, vault_id: str, vault_path: Path, encrypted_token: str
+    ) -> None:
+        """Run a scheduled sync, then bring the vault's search index up to date.
+
+        Args:
+            vault_id: The vault identifier.
+            vault_path: Path to the vault directory.
+            encrypted_token: Encrypted deploy token.
+        """
+        result = self._sync_vault(vault_id, vault_path, encrypted_token)
+        if not result["success"]:
+            return
+
+        try:
+            search_service.update_index(vault_id, vault_path)
+        except Exception as e:
+            logger.warning(f"Failed to update search index for vault '{vault_id}': {e}")
+
     def _sync_vault(
         self, vault_id: str, vault_path: Path, encrypted_token: str
     ) -> dict:
@@ -186,7 +206,7 @@ class VaultScheduler:
 
         for vault_id, vault_config in config.vaults.items():
             if vault_config.refresh_interval_minutes and vault_config.encrypted_token:
-                vault_path = Path(vault_config.path)
+                vault_path = vault_config.path_obj
                 if vault_path.exists():
                     self.schedule_vault_sync(
                         vault_id=vault_id,
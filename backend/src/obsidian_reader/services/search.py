@@ -1,172 +1,582 @@
 """Search service using SQLite FTS5 for full-text search."""
 
+import itertools
 import logging
+import multiprocessing
+import os
 import re
 import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
 
 import frontmatter
+from cachetools import LRUCache
 
 from ..core.config import settings
 from ..models.schemas import SearchResult
 
 logger = logging.getLogger(__name__)
 
+# Number of (vault, query) results remembered by SearchService
+SEARCH_CACHE_SIZE = 1024
+
+# Vault indexes built side by side by SearchService.build_indexes
+INDEX_BUILD_WORKERS = 4
+
+# Vaults with at least this many notes are parsed in worker processes on rebuild
+PARALLEL_BUILD_MIN_NOTES = 2000
+
+# Source of SearchIndex.generation values, unique across all indexes
+_generations = itertools.count()
+
+# Inline #tags in note bodies
+_INLINE_TAG_RE = re.compile(r"(?:^|\s)#([a-zA-Z0-9_/-]+)")
+
+# WAL lets searches read while a rebuild writes; in-memory databases
+# silently keep their own journal mode
+_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=30000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+_READ_CONNECTION_PRAGMAS = """
+    PRAGMA query_only=1;
+    PRAGMA busy_timeout=30000;
+    PRAGMA cache_size=-32000;
+"""
+
+# Size of each connection's prepared statement cache. Every statement is a
+# module-level constant with bound parameters, so repeated calls hit it.
+STATEMENT_CACHE_SIZE = 256
+
+_CREATE_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        path,
+        title,
+        content,
+        tags,
+        aliases,
+        tokenize='porter unicode61'
+    )
+"""
+
+_CREATE_METADATA_SQL = """
+    CREATE TABLE IF NOT EXISTS index_metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+"""
+
+# Lower-cased tags with the rowid of each note carrying them, so tag: queries
+# are B-tree seeks instead of FTS matches
+_CREATE_TAG_INDEX_SQL = """
+    CREATE TABLE IF NOT EXISTS tag_index (
+        tag TEXT NOT NULL,
+        note_rowid INTEGER NOT NULL
+    )
+"""
+
+_CREATE_TAG_INDEX_TAG_SQL = "CREATE INDEX IF NOT EXISTS ix_tag_index_tag ON tag_index(tag)"
+
+_CREATE_TAG_INDEX_NOTE_SQL = (
+    "CREATE INDEX IF NOT EXISTS ix_tag_index_note ON tag_index(note_rowid)"
+)
+
+# Rowid and mtime of each indexed note, so incremental updates find changed
+# notes and delete their rows by rowid without scanning notes_fts
+_CREATE_NOTE_FILES_SQL = """
+    CREATE TABLE IF NOT EXISTS note_files (
+        path TEXT PRIMARY KEY,
+        note_rowid INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL
+    )
+"""
+
+_DELETE_NOTES_SQL = "DELETE FROM notes_fts"
+
+_DELETE_TAGS_SQL = "DELETE FROM tag_index"
+
+_DELETE_NOTE_FILES_SQL = "DELETE FROM note_files"
+
+_INSERT_NOTE_SQL = """
+    INSERT INTO notes_fts (rowid, path, title, content, tags, aliases)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_TAG_SQL = "INSERT INTO tag_index (tag, note_rowid) VALUES (?, ?)"
+
+_INSERT_NOTE_FILE_SQL = """
+    INSERT OR REPLACE INTO note_files (path, note_rowid, mtime_ns) VALUES (?, ?, ?)
+"""
+
+_LAST_ROWID_SQL = "SELECT rowid FROM notes_fts ORDER BY rowid DESC LIMIT 1"
+
+_DELETE_NOTE_SQL = "DELETE FROM notes_fts WHERE rowid = ?"
+
+_DELETE_NOTE_TAGS_SQL = "DELETE FROM tag_index WHERE note_rowid = ?"
+
+_DELETE_NOTE_FILE_SQL = "DELETE FROM note_files WHERE path = ?"
+
+_SELECT_NOTE_FILES_SQL = "SELECT path, note_rowid, mtime_ns FROM note_files"
+
+_ANY_NOTE_FILE_SQL = "SELECT 1 FROM note_files LIMIT 1"
+
+_OPTIMIZE_SQL = "INSERT INTO notes_fts(notes_fts) VALUES('optimize')"
+
+_GET_METADATA_SQL = "SELECT value FROM index_metadata WHERE key = ?"
+
+_SET_METADATA_SQL = "INSERT OR REPLACE INTO index_metadata (key, value) VALUES (?, ?)"
+
+# index_metadata key: wall-clock time (ns) the last build or update started
+_LAST_INDEXED_KEY = "last_indexed_ns"
+
+# FTS5 BM25 ranking, with the match highlighted in the content column
+_SEARCH_SQL = """
+    SELECT
+        path,
+        title,
+        snippet(notes_fts, 2, '<mark>', '</mark>', '...', 50) as snippet,
+        bm25(notes_fts) as score
+    FROM notes_fts
+    WHERE notes_fts MATCH ?
+    ORDER BY score
+    LIMIT ?
+"""
+
+# Notes tagged exactly ? or nested below it (? || '/' <= tag < ? || '0',
+# since '0' follows '/')
+_TAG_SEARCH_SQL = """
+    SELECT path, title, substr(content, 1, 200) as snippet
+    FROM notes_fts
+    WHERE rowid IN (
+        SELECT note_rowid FROM tag_index
+        WHERE tag = ? OR (tag >= ? || '/' AND tag < ? || '0')
+    )
+    ORDER BY path
+    LIMIT ?
+"""
+
+_SIMPLE_SEARCH_SQL = """
+    SELECT path, title, substr(content, 1, 200) as snippet
+    FROM notes_fts
+    WHERE content LIKE ? OR title LIKE ? OR tags LIKE ?
+    LIMIT ?
+"""
+
+
+# A parsed note as stored in notes_fts: (path, title, content, tags, aliases)
+_NoteRow = tuple[str, str, str, str, str]
+
+# Notes found by a vault walk: index path -> (file path, mtime_ns)
+_ScannedNotes = dict[str, tuple[Path, int]]
+
+
+def _note_path(md_file: Path, vault_path: Path) -> str:
+    """Get the path a note is indexed under: relative to the vault, without .md."""
+    return str(md_file.relative_to(vault_path)).replace(".md", "")
+
+
+def _parse_note_file(md_file: Path, vault_path: Path) -> _NoteRow:
+    """Parse a markdown file into a (path, title, content, tags, aliases) row."""
+    post = frontmatter.load(md_file)
+    content = post.content
+
+    # Extract metadata
+    fm = post.metadata or {}
+    title = fm.get("title") or md_file.stem
+
+    # Handle aliases
+    aliases = fm.get("aliases", [])
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    aliases_str = " ".join(str(a) for a in aliases)
+
+    # Extract tags from frontmatter and content
+    tags: set[str] = set()
+
+    fm_tags = fm.get("tags", [])
+    if isinstance(fm_tags, list):
+        tags.update(str(t) for t in fm_tags)
+    elif isinstance(fm_tags, str):
+        tags.add(fm_tags)
+
+    # Extract inline tags
+    for match in _INLINE_TAG_RE.finditer(content):
+        tags.add(match.group(1))
+
+    tags_str = " ".join(tags)
+
+    return (_note_path(md_file, vault_path), str(title), content, tags_str, aliases_str)
+
+
+def _parse_note_or_error(md_file: Path, vault_path: Path) -> tuple[_NoteRow | None, str | None]:
+    """Worker process entry point: parse a note, returning the error text on failure."""
+    try:
+        return _parse_note_file(md_file, vault_path), None
+    except Exception as e:
+        return None, str(e)
+
 
 class SearchIndex:
     """SQLite FTS5 search index for a single vault."""
 
-    def __init__(self, vault_id: str, vault_path: Path):
+    # Rows handed to each executemany() call while building the index
+    BATCH_SIZE = 500
+
+    def __init__(self, vault_id: str, vault_path: Path, in_memory: bool = False):
         self.vault_id = vault_id
         self.vault_path = vault_path
+        self.in_memory = in_memory
         self.db_path = settings.data_dir / f"{vault_id}.db"
         self._connection: sqlite3.Connection | None = None
+        # Changes whenever the index contents are rebuilt
+        self.generation = next(_generations)
+        # Read-only connections used by search, one per thread
+        self._read_local = threading.local()
+        self._read_connections: list[sqlite3.Connection] = []
+        self._read_lock = threading.Lock()
+        # Serializes writes on the shared writer connection, whose explicit
+        # BEGIN/COMMIT transactions can't nest or interleave across threads
+        self._write_lock = threading.Lock()
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get or create database connection."""
         if self._connection is None:
-            settings.data_dir.mkdir(parents=True, exist_ok=True)
-            self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            if self.in_memory:
+                database = ":memory:"
+            else:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                database = str(self.db_path)
+            # Autocommit mode: build_index manages its own transaction
+            self._connection = sqlite3.connect(
+                database,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
             self._connection.row_factory = sqlite3.Row
+            self._connection.executescript(_CONNECTION_PRAGMAS)
         return self._connection
 
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, opening it if needed."""
+        if self.in_memory:
+            # A second ":memory:" connection would be a separate, empty database
+            return self._get_connection()
+
+        conn = getattr(self._read_local, "connection", None)
+        if conn is None:
+            # Make sure the database file exists before opening it read-only
+            self._get_connection()
+            conn = sqlite3.connect(
+                f"{self.db_path.absolute().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_READ_CONNECTION_PRAGMAS)
+            self._read_local.connection = conn
+            with self._read_lock:
+                self._read_connections.append(conn)
+        return conn
+
     def initialize(self) -> None:
         """Create the FTS5 virtual table if it doesn't exist."""
         conn = self._get_connection()
 
         # Create the FTS5 table for full-text search
-        conn.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
-                path,
-                title,
-                content,
-                tags,
-                aliases,
-                tokenize='porter unicode61'
-            )
-        """)
+        conn.execute(_CREATE_FTS_SQL)
 
         # Create a metadata table to track indexing
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS index_metadata (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
+        conn.execute(_CREATE_METADATA_SQL)
+
+        # Create the side table answering tag: queries
+        conn.execute(_CREATE_TAG_INDEX_SQL)
+        conn.execute(_CREATE_TAG_INDEX_TAG_SQL)
+        conn.execute(_CREATE_TAG_INDEX_NOTE_SQL)
+
+        # Create the per-note bookkeeping used by incremental updates
+        conn.execute(_CREATE_NOTE_FILES_SQL)
 
-        conn.commit()
         logger.info(f"Search index initialized for vault: {self.vault_id}")
 
-    def build_index(self) -> int:
-        """Build or rebuild the search index from vault files."""
+    def build_index(self, workers: int | None = None) -> int:
+        """Build or rebuild the search index from vault files.
+
+        Vaults with at least PARALLEL_BUILD_MIN_NOTES notes are parsed in
+        worker processes, as with build_index_parallel().
+
+        Args:
+            workers: Cap on worker processes for large vaults. Defaults to
+                the CPU count.
+        """
+        with self._write_lock:
+            return self._build_index(workers)
+
+    def _build_index(self, workers: int | None = None) -> int:
+        """Build the index; the caller holds _write_lock."""
+        started_ns = time.time_ns()
+        notes = self._scan_notes()
+
+        if len(notes) >= PARALLEL_BUILD_MIN_NOTES:
+            return self._build_parallel(started_ns, notes, workers)
+        md_files = (md_file for md_file, _ in notes.values())
+        return self._rebuild(started_ns, self._parse_notes(md_files), notes)
+
+    def build_index_parallel(self, workers: int | None = None) -> int:
+        """Build or rebuild the search index, parsing notes in worker processes.
+
+        Parsing frontmatter and tags is CPU-bound Python, so it is spread over
+        a process pool to get around the GIL. Rows stream back to this
+        process, which writes them in one transaction exactly as
+        build_index() does.
+
+        Args:
+            workers: Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            The number of indexed notes.
+        """
+        with self._write_lock:
+            started_ns = time.time_ns()
+            return self._build_parallel(started_ns, self._scan_notes(), workers)
+
+    def _build_parallel(self, started_ns: int, notes: _ScannedNotes, workers: int | None) -> int:
+        """Rebuild the index from the scanned notes parsed on a process pool."""
+        md_files = [md_file for md_file, _ in notes.values()]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(md_files)))
+        # Spawned workers don't inherit the server's threads and locks
+        context = multiprocessing.get_context("spawn")
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            rows = self._parse_notes_with(executor, md_files, workers)
+            return self._rebuild(started_ns, rows, notes)
+
+    def _rebuild(self, started_ns: int, rows: Iterable[_NoteRow], notes: _ScannedNotes) -> int:
+        """Replace the whole index with rows in one transaction."""
         conn = self._get_connection()
 
-        # Clear existing data
-        conn.execute("DELETE FROM notes_fts")
+        conn.execute("BEGIN")
+        try:
+            # Clear existing data
+            conn.execute(_DELETE_NOTES_SQL)
+            conn.execute(_DELETE_TAGS_SQL)
+            conn.execute(_DELETE_NOTE_FILES_SQL)
+
+            indexed_count = self._insert_rows(conn, rows, notes)
+
+            # Merge the segments written during the load into a single b-tree
+            conn.execute(_OPTIMIZE_SQL)
+            conn.execute(_SET_METADATA_SQL, (_LAST_INDEXED_KEY, str(started_ns)))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+        self.generation = next(_generations)
+        logger.info(f"Indexed {indexed_count} notes for vault: {self.vault_id}")
 
-        indexed_count = 0
+        return indexed_count
 
-        for md_file in self.vault_path.rglob("*.md"):
-            # Skip hidden files
-            if any(part.startswith(".") for part in md_file.parts):
-                continue
+    def incremental_update(self, since_ns: int | None = None) -> int:
+        """Re-index only the notes added or modified since the last build or update.
+
+        Notes whose files were removed are dropped from the index. A note
+        counts as changed when its modification time differs from the one
+        recorded when it was indexed.
 
+        Args:
+            since_ns: Also treat files modified after this wall-clock time (ns)
+                as changed. Defaults to when the last build or update started.
+
+        Returns:
+            The number of notes re-indexed. Falls back to a full build when
+            the index has never been built or has no per-note records.
+        """
+        with self._write_lock:
+            return self._incremental_update(since_ns)
+
+    def _incremental_update(self, since_ns: int | None) -> int:
+        """Apply an incremental update; the caller holds _write_lock."""
+        conn = self._get_connection()
+
+        if conn.execute(_ANY_NOTE_FILE_SQL).fetchone() is None:
+            return self._build_index()
+        if since_ns is None:
+            row = conn.execute(_GET_METADATA_SQL, (_LAST_INDEXED_KEY,)).fetchone()
+            if row is None:
+                return self._build_index()
+            since_ns = int(row["value"])
+
+        # Recorded before walking, so edits made during the walk are seen next time
+        started_ns = time.time_ns()
+        notes = self._scan_notes()
+
+        conn.execute("BEGIN")
+        try:
+            indexed = {
+                row["path"]: (row["note_rowid"], row["mtime_ns"])
+                for row in conn.execute(_SELECT_NOTE_FILES_SQL)
+            }
+
+            removed = indexed.keys() - notes.keys()
+            changed = [
+                rel_path
+                for rel_path, (_, mtime_ns) in notes.items()
+                if mtime_ns > since_ns
+                or rel_path not in indexed
+                or indexed[rel_path][1] != mtime_ns
+            ]
+
+            # Delete the old rows by rowid, then re-insert the notes that still exist
+            stale = [(indexed[p][0],) for p in itertools.chain(removed, changed) if p in indexed]
+            conn.executemany(_DELETE_NOTE_TAGS_SQL, stale)
+            conn.executemany(_DELETE_NOTE_SQL, stale)
+            conn.executemany(_DELETE_NOTE_FILE_SQL, [(p,) for p in removed])
+            updated_count = self._insert_rows(
+                conn, self._parse_notes(notes[p][0] for p in changed), notes
+            )
+            conn.execute(_SET_METADATA_SQL, (_LAST_INDEXED_KEY, str(started_ns)))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+        if removed or changed:
+            self.generation = next(_generations)
+        logger.info(
+            f"Updated {updated_count} and removed {len(removed)} notes "
+            f"for vault: {self.vault_id}"
+        )
+
+        return updated_count
+
+    def _scan_notes(self) -> _ScannedNotes:
+        """Walk the vault and map index paths to (file path, mtime_ns).
+
+        Hidden files and folders inside the vault are skipped.
+        """
+        notes: _ScannedNotes = {}
+        stack = [str(self.vault_path)]
+
+        while stack:
+            directory = stack.pop()
             try:
-                # Parse the file
-                post = frontmatter.load(md_file)
-                content = post.content
-
-                # Extract metadata
-                fm = post.metadata or {}
-                title = fm.get("title") or md_file.stem
-
-                # Handle aliases
-                aliases = fm.get("aliases", [])
-                if isinstance(aliases, str):
-                    aliases = [aliases]
-                aliases_str = " ".join(str(a) for a in aliases)
-
-                # Extract tags from frontmatter and content
-                tags: set[str] = set()
-
-                fm_tags = fm.get("tags", [])
-                if isinstance(fm_tags, list):
-                    tags.update(str(t) for t in fm_tags)
-                elif isinstance(fm_tags, str):
-                    tags.add(fm_tags)
-
-                # Extract inline tags
-                tag_pattern = r"(?:^|\s)#([a-zA-Z0-9_/-]+)"
-                for match in re.finditer(tag_pattern, content):
-                    tags.add(match.group(1))
-
-                tags_str = " ".join(tags)
-
-                # Get relative path
-                rel_path = str(md_file.relative_to(self.vault_path)).replace(".md", "")
-
-                # Insert into FTS table
-                conn.execute(
-                    """
-                    INSERT INTO notes_fts (path, title, content, tags, aliases)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (rel_path, str(title), content, tags_str, aliases_str),
-                )
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            md_file = Path(entry.path)
+                            rel_path = _note_path(md_file, self.vault_path)
+                            notes[rel_path] = (md_file, entry.stat().st_mtime_ns)
+            except OSError:
+                continue
 
-                indexed_count += 1
+        return notes
 
+    def _parse_notes(self, md_files: Iterable[Path]) -> Iterator[_NoteRow]:
+        """Parse notes in this thread, logging and skipping the ones that fail."""
+        for md_file in md_files:
+            try:
+                yield self._parse_note(md_file)
             except Exception as e:
                 logger.warning(f"Failed to index {md_file}: {e}")
-                continue
 
-        conn.commit()
-        logger.info(f"Indexed {indexed_count} notes for vault: {self.vault_id}")
-
-        return indexed_count
+    def _parse_notes_with(
+        self, executor: Executor, md_files: list[Path], workers: int
+    ) -> Iterator[_NoteRow]:
+        """Parse notes on an executor, logging and skipping the ones that fail."""
+        results = executor.map(
+            _parse_note_or_error,
+            md_files,
+            itertools.repeat(self.vault_path),
+            chunksize=max(1, len(md_files) // (workers * 4)),
+        )
+        for md_file, (row, error) in zip(md_files, results):
+            if row is None:
+                logger.warning(f"Failed to index {md_file}: {error}")
+            else:
+                yield row
+
+    def _insert_rows(
+        self, conn: sqlite3.Connection, rows: Iterable[_NoteRow], notes: _ScannedNotes
+    ) -> int:
+        """Insert parsed notes in BATCH_SIZE batches, returning the count.
+
+        Rowids are assigned here so each note's tags and note_files record
+        can be written in the same batch. notes supplies the mtimes.
+        """
+        last = conn.execute(_LAST_ROWID_SQL).fetchone()
+        next_rowid = last[0] + 1 if last else 1
+
+        inserted_count = 0
+        batch: list[tuple[int, str, str, str, str, str]] = []
+        tag_rows: list[tuple[str, int]] = []
+        file_rows: list[tuple[str, int, int]] = []
+
+        def flush() -> None:
+            conn.executemany(_INSERT_NOTE_SQL, batch)
+            conn.executemany(_INSERT_TAG_SQL, tag_rows)
+            conn.executemany(_INSERT_NOTE_FILE_SQL, file_rows)
+            batch.clear()
+            tag_rows.clear()
+            file_rows.clear()
+
+        for row in rows:
+            batch.append((next_rowid, *row))
+            tag_rows.extend((tag.lower(), next_rowid) for tag in row[3].split())
+            file_rows.append((row[0], next_rowid, notes[row[0]][1]))
+            next_rowid += 1
+            inserted_count += 1
+
+            if len(batch) >= self.BATCH_SIZE:
+                flush()
+
+        if batch:
+            flush()
+
+        return inserted_count
+
+    def _parse_note(self, md_file: Path) -> _NoteRow:
+        """Parse a markdown file of this vault into a notes_fts row."""
+        return _parse_note_file(md_file, self.vault_path)
 
     def search(self, query: str, limit: int = 50) -> list[SearchResult]:
         """Search for notes matching the query."""
-        conn = self._get_connection()
+        # Tag search: tag:name -> exact lookup in tag_index, also matching
+        # nested tags such as name/child
+        if query.startswith("tag:"):
+            return self._tag_search(query[4:], limit)
 
-        results: list[SearchResult] = []
+        conn = self._get_read_connection()
 
-        # Handle special search operators
-        search_query = query
+        results: list[SearchResult] = []
 
-        # Tag search: tag:name -> search in tags column
-        if query.startswith("tag:"):
-            tag_name = query[4:]
-            search_query = f'tags:"{tag_name}"'
-        else:
-            # Regular search - escape special characters and add wildcards
-            # FTS5 query syntax
-            words = query.split()
-            search_terms = []
-            for word in words:
-                # Escape special characters
-                word = word.replace('"', '""')
-                # Add prefix matching with *
-                search_terms.append(f'"{word}"*')
-            search_query = " OR ".join(search_terms)
+        # Regular search - escape special characters and add wildcards
+        # FTS5 query syntax
+        words = query.split()
+        search_terms = []
+        for word in words:
+            # Escape special characters
+            word = word.replace('"', '""')
+            # Add prefix matching with *
+            search_terms.append(f'"{word}"*')
+        search_query = " OR ".join(search_terms)
 
         try:
             # Use FTS5 BM25 ranking
-            cursor = conn.execute(
-                """
-                SELECT
-                    path,
-                    title,
-                    snippet(notes_fts, 2, '<mark>', '</mark>', '...', 50) as snippet,
-                    bm25(notes_fts) as score
-                FROM notes_fts
-                WHERE notes_fts MATCH ?
-                ORDER BY score
-                LIMIT ?
-                """,
-                (search_query, limit),
-            )
+            cursor = conn.execute(_SEARCH_SQL, (search_query, limit))
 
             for row in cursor:
                 results.append(
@@ -185,22 +595,33 @@ class SearchIndex:
 
         return results
 
+    def _tag_search(self, tag_name: str, limit: int) -> list[SearchResult]:
+        """Find notes carrying a tag, or a tag nested below it."""
+        tag = tag_name.strip().removeprefix("#").lower()
+        if not tag:
+            return []
+
+        conn = self._get_read_connection()
+        cursor = conn.execute(_TAG_SEARCH_SQL, (tag, tag, tag, limit))
+
+        return [
+            SearchResult(
+                path=row["path"],
+                title=row["title"],
+                snippet=row["snippet"] + "...",
+                score=1.0,
+            )
+            for row in cursor
+        ]
+
     def _simple_search(self, query: str, limit: int) -> list[SearchResult]:
         """Fallback simple search using LIKE."""
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         results: list[SearchResult] = []
 
         like_query = f"%{query}%"
 
-        cursor = conn.execute(
-            """
-            SELECT path, title, substr(content, 1, 200) as snippet
-            FROM notes_fts
-            WHERE content LIKE ? OR title LIKE ? OR tags LIKE ?
-            LIMIT ?
-            """,
-            (like_query, like_query, like_query, limit),
-        )
+        cursor = conn.execute(_SIMPLE_SEARCH_SQL, (like_query, like_query, like_query, limit))
 
         for row in cursor:
             results.append(
@@ -215,45 +636,135 @@ class SearchIndex:
         return results
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self._connection:
+        """Close the database connections."""
+        with self._read_lock:
+            read_connections, self._read_connections = self._read_connections, []
+            self._read_local = threading.local()
+        for conn in read_connections:
             try:
-                self._connection.close()
+                conn.close()
             except sqlite3.ProgrammingError:
-                # Ignore threading errors on close
                 pass
-            self._connection = None
+
+        with self._write_lock:
+            if self._connection:
+                try:
+                    self._connection.close()
+                except sqlite3.ProgrammingError:
+                    # Ignore threading errors on close
+                    pass
+                self._connection = None
 
 
 class SearchService:
     """Service for managing search indexes across multiple vaults."""
 
-    def __init__(self):
+    def __init__(self, in_memory: bool = False):
+        """Initialize the search service.
+
+        Args:
+            in_memory: Keep indexes in memory instead of under settings.data_dir.
+                They are lost when closed, which suits tests.
+        """
+        self.in_memory = in_memory
         self._indexes: dict[str, SearchIndex] = {}
+        # Guards _indexes so concurrent callers share one index per vault
+        self._indexes_lock = threading.Lock()
+        # Keyed by (vault_id, query, index generation) so rebuilds invalidate
+        self._results: LRUCache[tuple[str, str, int], list[SearchResult]] = LRUCache(
+            maxsize=SEARCH_CACHE_SIZE
+        )
+        self._results_lock = threading.Lock()
 
     def get_or_create_index(self, vault_id: str, vault_path: Path) -> SearchIndex:
         """Get or create a search index for a vault."""
-        if vault_id not in self._indexes:
-            index = SearchIndex(vault_id, vault_path)
-            index.initialize()
-            self._indexes[vault_id] = index
-        return self._indexes[vault_id]
+        index = self._indexes.get(vault_id)
+        if index is not None:
+            return index
+
+        with self._indexes_lock:
+            if vault_id not in self._indexes:
+                index = SearchIndex(vault_id, vault_path, in_memory=self.in_memory)
+                index.initialize()
+                self._indexes[vault_id] = index
+            return self._indexes[vault_id]
 
     def build_index(self, vault_id: str, vault_path: Path) -> int:
         """Build or rebuild the search index for a vault."""
         index = self.get_or_create_index(vault_id, vault_path)
         return index.build_index()
 
+    def build_indexes(self, vaults: dict[str, Path]) -> dict[str, int]:
+        """Build the search indexes for several vaults concurrently.
+
+        Each vault has its own database file, so the builds don't contend
+        for a write lock. Vaults whose build fails are logged and left out
+        of the result.
+
+        Args:
+            vaults: Mapping of vault_id to vault path.
+
+        Returns:
+            Mapping of vault_id to the number of indexed notes.
+        """
+        # Create the indexes up front so worker threads never touch _indexes
+        indexes = {
+            vault_id: self.get_or_create_index(vault_id, vault_path)
+            for vault_id, vault_path in vaults.items()
+        }
+        if not indexes:
+            return {}
+
+        counts: dict[str, int] = {}
+        workers = min(INDEX_BUILD_WORKERS, len(indexes))
+        # Split the CPUs between concurrent builds, so several large vaults
+        # don't each start a full process pool
+        processes = max(1, (os.cpu_count() or 1) // workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                vault_id: executor.submit(index.build_index, processes)
+                for vault_id, index in indexes.items()
+            }
+            for vault_id, future in futures.items():
+                try:
+                    counts[vault_id] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to build search index for {vault_id}: {e}")
+        return counts
+
+    def update_index(self, vault_id: str, vault_path: Path) -> int:
+        """Re-index the notes of a vault that changed since its last indexing."""
+        index = self.get_or_create_index(vault_id, vault_path)
+        return index.incremental_update()
+
     def search(self, vault_id: str, vault_path: Path, query: str) -> list[SearchResult]:
         """Search in a specific vault."""
         index = self.get_or_create_index(vault_id, vault_path)
-        return index.search(query)
+        key = (vault_id, query, index.generation)
+
+        with self._results_lock:
+            cached = self._results.get(key)
+        if cached is not None:
+            return list(cached)
+
+        results = index.search(query)
+        with self._results_lock:
+            self._results[key] = results
+        return list(results)
+
+    def cache_clear(self) -> None:
+        """Forget all cached search results."""
+        with self._results_lock:
+            self._results.clear()
 
     def close_all(self) -> None:
         """Close all search index connections."""
-        for index in self._indexes.values():
+        with self._indexes_lock:
+            indexes = list(self._indexes.values())
+            self._indexes.clear()
+        for index in indexes:
             index.close()
-        self._indexes.clear()
+        self.cache_clear()
 
 
 # Global search service instance
@@ -1,14 +1,111 @@
 """Vault service for reading and processing a single Obsidian vault."""
 
 import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import frontmatter
+from cachetools import LRUCache
 
 from ..models.schemas import BacklinkInfo, FileTreeItem, NoteResponse
 
+# Matches [[note]], [[note|alias]] and [[note#heading]], capturing the link target
+_WIKILINK_RE = re.compile(r"\[\[([^\]|#]+)(?:[|#][^\]]+)?\]\]")
+# Matches inline #tags, capturing the tag without the hash
+_INLINE_TAG_RE = re.compile(r"(?:^|\s)#([a-zA-Z0-9_/-]+)")
+
+# Seconds a computed note count is reused before the vault is walked again
+NOTE_COUNT_TTL = 60.0
+
+# Parsed notes kept per vault; entries are reused while the file's mtime is unchanged
+NOTE_CACHE_SIZE = 512
+
+# Read size for streaming content search, matching typical filesystem block multiples
+SEARCH_CHUNK_SIZE = 64 * 1024
+# Bytes of context on each side of a match in search snippets
+SNIPPET_CONTEXT = 50
+
+
+def _compile_search_pattern(query: str) -> tuple[re.Pattern[bytes], int]:
+    """Compile a case-insensitive pattern matching the query in UTF-8 bytes.
+
+    re.IGNORECASE only folds ASCII letters in bytes patterns, so non-ASCII
+    characters are expanded into an alternation of their case variants.
+
+    Returns:
+        The compiled pattern and the maximum length in bytes of a match.
+    """
+    parts: list[bytes] = []
+    max_length = 0
+    for char in query:
+        variants = {char, char.lower(), char.upper()}
+        if char.isascii() or len(variants) == 1:
+            encoded = char.encode("utf-8")
+            parts.append(re.escape(encoded))
+            max_length += len(encoded)
+        else:
+            alternatives = sorted((v.encode("utf-8") for v in variants), key=len, reverse=True)
+            parts.append(b"(?:" + b"|".join(map(re.escape, alternatives)) + b")")
+            max_length += len(alternatives[0])
+    return re.compile(b"".join(parts), re.IGNORECASE), max_length
+
+
+def _find_snippet(path: Path, pattern: re.Pattern[bytes], max_length: int) -> str | None:
+    """Stream a file looking for the pattern and return a snippet around the first hit.
+
+    The file is read in fixed-size chunks, carrying over the last
+    ``max_length - 1`` bytes so matches spanning a chunk boundary are found.
+    Reading stops at the first chunk containing a match.
+    """
+    overlap = max(max_length - 1, 0)
+
+    with open(path, "rb", buffering=SEARCH_CHUNK_SIZE) as f:
+        offset = 0  # File offset of buffer[0]
+        buffer = b""
+        while chunk := f.read(SEARCH_CHUNK_SIZE):
+            buffer += chunk
+            match = pattern.search(buffer)
+            if match is not None:
+                break
+            keep = min(overlap, len(buffer))
+            offset += len(buffer) - keep
+            buffer = buffer[len(buffer) - keep :]
+        else:
+            return None
+
+        # Re-read just the window around the match
+        start = max(0, offset + match.start() - SNIPPET_CONTEXT)
+        end = offset + match.end() + SNIPPET_CONTEXT
+        f.seek(start)
+        window = f.read(end - start + 1)
+
+    snippet = window[: end - start].decode("utf-8", errors="ignore")
+    if start > 0:
+        snippet = "..." + snippet
+    if len(window) > end - start:
+        snippet = snippet + "..."
+    return snippet
+
+
+@dataclass(slots=True, frozen=True)
+class _ParsedNote:
+    """The parts of a note that only depend on its own file."""
+
+    mtime_ns: int
+    title: str
+    frontmatter: dict[str, Any]
+    tags: list[str]
+    content: str
+    modified_at: datetime
+
 
 class VaultService:
     """Service for reading and processing a single Obsidian vault."""
@@ -17,61 +114,96 @@ class VaultService:
         self.vault_id = vault_id
         self.vault_path = vault_path
         self.vault_name = vault_name
-        self._note_cache: dict[str, dict[str, Any]] = {}
-        self._backlinks: dict[str, list[BacklinkInfo]] = {}
+        # Resolved vault root, computed once for the containment checks
+        self._root = os.path.realpath(vault_path)
+        # Parsed notes by full path, checked against the file's mtime on each hit
+        self._note_cache: LRUCache[str, _ParsedNote] = LRUCache(maxsize=NOTE_CACHE_SIZE)
+        self._note_cache_lock = threading.Lock()
+        # Backlink index: link target as written -> {source note path: BacklinkInfo}
+        self._backlinks: defaultdict[str, dict[str, BacklinkInfo]] = defaultdict(dict)
+        # Indexed source notes: path -> (mtime_ns, link targets, shared BacklinkInfo)
+        self._backlink_sources: dict[
+            str, tuple[int, frozenset[str], BacklinkInfo | None]
+        ] = {}
+        # Shared BacklinkInfo per (source path, title), reused across every target it links
+        self._backlink_infos: dict[tuple[str, str], BacklinkInfo] = {}
+        self._backlinks_lock = threading.Lock()
+        # Cached get_note_count() result and when it was computed (monotonic)
+        self._note_count: int | None = None
+        self._note_count_at = 0.0
 
     def validate(self) -> bool:
         """Check if the vault path exists and is accessible."""
         return self.vault_path.exists() and self.vault_path.is_dir()
 
     def get_note_count(self) -> int:
-        """Count the number of markdown files in the vault."""
-        if not self.validate():
-            return 0
-        return sum(1 for _ in self.vault_path.rglob("*.md"))
+        """Count the number of markdown files in the vault.
+
+        The count is cached for NOTE_COUNT_TTL seconds so repeated vault
+        listings don't walk the whole vault each time. Call
+        invalidate_note_count() when the vault is known to have changed.
+        """
+        now = time.monotonic()
+        if self._note_count is not None and now - self._note_count_at < NOTE_COUNT_TTL:
+            return self._note_count
+
+        count = sum(1 for _ in self._iter_markdown_entries()) if self.validate() else 0
+        self._note_count = count
+        self._note_count_at = now
+        return count
+
+    def invalidate_note_count(self) -> None:
+        """Force the next get_note_count() call to recount the vault."""
+        self._note_count = None
+
+    def clear_note_cache(self) -> None:
+        """Drop every parsed note, e.g. after the vault was synced."""
+        with self._note_cache_lock:
+            self._note_cache.clear()
 
     def build_file_tree(self) -> list[FileTreeItem]:
         """Build a hierarchical file tree of the vault."""
         if not self.validate():
             return []
 
-        def build_tree(path: Path, relative_base: Path) -> list[FileTreeItem]:
+        root = str(self.vault_path)
+
+        # Items are built from local directory entries, so validation is skipped
+        def build_tree(directory: str) -> list[FileTreeItem]:
             items: list[FileTreeItem] = []
 
-            # Get sorted entries (folders first, then files)
+            # Get visible entries, skipping hidden files and directories. The
+            # dirent type is cached, so is_dir() needs no extra stat call.
             try:
-                entries = sorted(
-                    path.iterdir(),
-                    key=lambda x: (not x.is_dir(), x.name.lower()),
-                )
-            except PermissionError:
+                with os.scandir(directory) as it:
+                    entries = [(e, e.is_dir()) for e in it if not e.name.startswith(".")]
+            except OSError:
                 return items
 
-            for entry in entries:
-                # Skip hidden files and directories
-                if entry.name.startswith("."):
-                    continue
+            # Sort folders first, then files
+            entries.sort(key=lambda item: (not item[1], item[0].name.lower()))
 
-                relative_path = str(entry.relative_to(relative_base))
+            for entry, is_dir in entries:
+                relative_path = os.path.relpath(entry.path, root)
 
-                if entry.is_dir():
+                if is_dir:
                     # Recursively build tree for directories
-                    children = build_tree(entry, relative_base)
+                    children = build_tree(entry.path)
                     # Only include non-empty directories
                     if children:
                         items.append(
-                            FileTreeItem(
+                            FileTreeItem.model_construct(
                                 name=entry.name,
                                 path=relative_path,
                                 type="folder",
                                 children=children,
                             )
                         )
-                elif entry.suffix.lower() == ".md":
+                elif entry.name.lower().endswith(".md"):
                     # Include markdown files
                     items.append(
-                        FileTreeItem(
-                            name=entry.stem,  # Remove .md extension for display
+                        FileTreeItem.model_construct(
+                            name=entry.name[:-3],  # Remove .md extension for display
                             path=relative_path,
                             type="file",
                             children=None,
@@ -80,7 +212,7 @@ class VaultService:
 
             return items
 
-        return build_tree(self.vault_path, self.vault_path)
+        return build_tree(root)
 
     def get_note(self, note_path: str) -> NoteResponse | None:
         """Get a note by its path relative to the vault root."""
@@ -88,50 +220,64 @@ class VaultService:
         if not note_path.endswith(".md"):
             note_path = f"{note_path}.md"
 
-        full_path = self.vault_path / note_path
-
         # Security check: ensure path is within vault
-        try:
-            full_path = full_path.resolve()
-            self.vault_path.resolve()
-            if not str(full_path).startswith(str(self.vault_path.resolve())):
-                return None
-        except (OSError, ValueError):
+        full_path = self._resolve_in_vault(note_path)
+        if full_path is None:
             return None
 
         if not full_path.exists() or not full_path.is_file():
             return None
 
         try:
-            # Parse the note with frontmatter
-            post = frontmatter.load(full_path)
-
-            # Extract metadata
-            fm_data = dict(post.metadata) if post.metadata else {}
-            title = fm_data.get("title") or fm_data.get("aliases", [None])[0] or full_path.stem
-            tags = self._extract_tags(post.content, fm_data)
+            parsed = self._parse_note(full_path)
 
-            # Get file modification time
-            stat = full_path.stat()
-            modified_at = datetime.fromtimestamp(stat.st_mtime)
-
-            # Get backlinks for this note
+            # Backlinks depend on other notes, so they are looked up every time
             backlinks = self._get_backlinks(note_path)
 
-            # Content will be rendered by the markdown service
-            return NoteResponse(
+            # Content will be rendered by the markdown service. Every field is
+            # built with the declared type, so validation is skipped.
+            return NoteResponse.model_construct(
                 path=note_path.replace(".md", ""),
-                title=str(title),
-                content_html=post.content,  # Raw markdown, will be rendered later
-                frontmatter=fm_data,
-                tags=tags,
+                title=parsed.title,
+                content_html=parsed.content,  # Raw markdown, will be rendered later
+                frontmatter=dict(parsed.frontmatter),
+                tags=list(parsed.tags),
                 backlinks=backlinks,
-                modified_at=modified_at,
+                modified_at=parsed.modified_at,
             )
 
         except Exception:
             return None
 
+    def _parse_note(self, full_path: Path) -> _ParsedNote:
+        """Parse a note file, reusing the cached result while its mtime is unchanged."""
+        stat = full_path.stat()
+        key = str(full_path)
+
+        with self._note_cache_lock:
+            cached = self._note_cache.get(key)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns:
+            return cached
+
+        # Parse the note with frontmatter
+        post = frontmatter.load(full_path)
+
+        # Extract metadata
+        fm_data = dict(post.metadata) if post.metadata else {}
+        title = fm_data.get("title") or fm_data.get("aliases", [None])[0] or full_path.stem
+
+        parsed = _ParsedNote(
+            mtime_ns=stat.st_mtime_ns,
+            title=str(title),
+            frontmatter=fm_data,
+            tags=self._extract_tags(post.content, fm_data),
+            content=post.content,
+            modified_at=datetime.fromtimestamp(stat.st_mtime),
+        )
+        with self._note_cache_lock:
+            self._note_cache[key] = parsed
+        return parsed
+
     def _extract_tags(self, content: str, frontmatter_data: dict[str, Any]) -> list[str]:
         """Extract tags from both frontmatter and content."""
         tags: set[str] = set()
@@ -144,10 +290,7 @@ class VaultService:
             tags.add(fm_tags)
 
         # Tags from content (inline #tags)
-        import re
-
-        tag_pattern = r"(?:^|\s)#([a-zA-Z0-9_/-]+)"
-        for match in re.finditer(tag_pattern, content):
+        for match in _INLINE_TAG_RE.finditer(content):
             tags.add(match.group(1))
 
         return sorted(tags)
@@ -158,56 +301,135 @@ class VaultService:
         target = note_path.replace(".md", "")
         target_name = Path(target).name
 
-        backlinks: list[BacklinkInfo] = []
+        with self._backlinks_lock:
+            self._refresh_backlink_index()
+            # Links may use the note's basename or its full path
+            sources = {
+                **self._backlinks.get(target_name, {}),
+                **self._backlinks.get(target, {}),
+            }
 
-        # Search all markdown files for links to this note
-        for md_file in self.vault_path.rglob("*.md"):
-            if str(md_file.relative_to(self.vault_path)).replace(".md", "") == target:
-                continue  # Skip self
+        sources.pop(target, None)  # Skip self
+        return sorted(sources.values(), key=lambda info: info.path)
 
-            try:
-                content = md_file.read_text(encoding="utf-8")
-
-                # Check for wiki links to this note
-                import re
-
-                # Match [[note]] or [[note|alias]] or [[note#heading]]
-                link_pattern = r"\[\[([^\]|#]+)(?:[|#][^\]]+)?\]\]"
-                for match in re.finditer(link_pattern, content):
-                    link_target = match.group(1).strip()
-                    # Check if this link points to our target
-                    if link_target == target_name or link_target == target:
-                        # Get title from the linking note
-                        try:
-                            post = frontmatter.load(md_file)
-                            link_title = (
-                                post.metadata.get("title")
-                                or post.metadata.get("aliases", [None])[0]
-                                or md_file.stem
-                            )
-                        except Exception:
-                            link_title = md_file.stem
+    def _refresh_backlink_index(self) -> None:
+        """Bring the backlink index up to date with the vault on disk.
 
-                        rel_path = str(md_file.relative_to(self.vault_path)).replace(".md", "")
-                        backlinks.append(BacklinkInfo(path=rel_path, title=str(link_title)))
-                        break  # Only add each file once
+        The first call reads every note once. Later calls only stat files and
+        re-scan notes that were added or whose modification time changed.
+        """
+        current = self._scan_markdown_files()
 
-            except Exception:
+        for rel_path in self._backlink_sources.keys() - current.keys():
+            self._drop_backlink_source(rel_path)
+
+        for rel_path, (full_path, mtime_ns) in current.items():
+            known = self._backlink_sources.get(rel_path)
+            if known is not None and known[0] == mtime_ns:
                 continue
+            self._drop_backlink_source(rel_path)
+            self._index_backlink_source(rel_path, full_path, mtime_ns)
 
-        return backlinks
+    def _iter_markdown_entries(self) -> Iterator[os.DirEntry[str]]:
+        """Walk the vault with os.scandir, yielding every visible markdown file."""
+        stack = [str(self.vault_path)]
 
-    def get_attachment_path(self, attachment_path: str) -> Path | None:
-        """Get the full path to an attachment file."""
-        full_path = self.vault_path / attachment_path
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        # Skip hidden files and directories (.obsidian, .git, .trash)
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            yield entry
+            except OSError:
+                continue
 
-        # Security check
+    def _scan_markdown_files(self) -> dict[str, tuple[str, int]]:
+        """Walk the vault and map note paths (without .md) to (full path, mtime_ns)."""
+        root = str(self.vault_path)
+        return {
+            os.path.relpath(entry.path, root)[:-3]: (entry.path, entry.stat().st_mtime_ns)
+            for entry in self._iter_markdown_entries()
+        }
+
+    def _index_backlink_source(self, rel_path: str, full_path: str, mtime_ns: int) -> None:
+        """Extract the wiki-link targets of one note and add them to the index."""
+        targets: frozenset[str] = frozenset()
+        info: BacklinkInfo | None = None
+
+        try:
+            with open(full_path, encoding="utf-8") as f:
+                content = f.read()
+            targets = frozenset(m.group(1).strip() for m in _WIKILINK_RE.finditer(content))
+        except Exception:
+            pass
+
+        if targets:
+            # Get title from the linking note
+            stem = Path(full_path).stem
+            try:
+                metadata = frontmatter.loads(content).metadata
+                title = metadata.get("title") or metadata.get("aliases", [None])[0] or stem
+            except Exception:
+                title = stem
+
+            info = self._backlink_info(rel_path, str(title))
+            for link_target in targets:
+                self._backlinks[link_target][info.path] = info
+
+        self._backlink_sources[rel_path] = (mtime_ns, targets, info)
+
+    def _drop_backlink_source(self, rel_path: str) -> None:
+        """Remove one note's contributions from the backlink index."""
+        known = self._backlink_sources.pop(rel_path, None)
+        if known is None:
+            return
+
+        _, targets, info = known
+        for link_target in targets:
+            sources = self._backlinks.get(link_target)
+            if sources is not None:
+                sources.pop(rel_path, None)
+                if not sources:
+                    del self._backlinks[link_target]
+        if info is not None:
+            self._backlink_infos.pop((info.path, info.title), None)
+
+    def _backlink_info(self, rel_path: str, title: str) -> BacklinkInfo:
+        """Get the shared BacklinkInfo for a source note, creating it on first use."""
+        key = (sys.intern(rel_path), sys.intern(title))
+        info = self._backlink_infos.get(key)
+        if info is None:
+            info = BacklinkInfo(path=key[0], title=key[1])
+            self._backlink_infos[key] = info
+        return info
+
+    def _resolve_in_vault(self, relative_path: str) -> Path | None:
+        """Resolve a vault-relative path, or return None if it leads outside the vault.
+
+        Symlinks are resolved before the check, and containment is decided by
+        path components, so a sibling such as ``vault-other`` doesn't pass as
+        being inside ``vault``.
+        """
         try:
-            full_path = full_path.resolve()
-            if not str(full_path).startswith(str(self.vault_path.resolve())):
+            candidate = os.path.realpath(os.path.join(self._root, relative_path))
+            if os.path.commonpath([candidate, self._root]) != self._root:
                 return None
         except (OSError, ValueError):
             return None
+        return Path(candidate)
+
+    def get_attachment_path(self, attachment_path: str) -> Path | None:
+        """Get the full path to an attachment file."""
+        # Security check
+        full_path = self._resolve_in_vault(attachment_path)
+        if full_path is None:
+            return None
 
         if full_path.exists() and full_path.is_file():
             return full_path
@@ -219,37 +441,28 @@ class VaultService:
         Returns list of (path, title, snippet) tuples.
         """
         results: list[tuple[str, str, str]] = []
-        query_lower = query.lower()
+        pattern, max_length = _compile_search_pattern(query)
 
         for md_file in self.vault_path.rglob("*.md"):
             try:
-                content = md_file.read_text(encoding="utf-8")
-                content_lower = content.lower()
-
-                if query_lower in content_lower:
-                    # Get title
-                    try:
-                        post = frontmatter.load(md_file)
-                        title = (
-                            post.metadata.get("title")
-                            or post.metadata.get("aliases", [None])[0]
-                            or md_file.stem
-                        )
-                    except Exception:
-                        title = md_file.stem
-
-                    # Create snippet around first match
-                    idx = content_lower.find(query_lower)
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + len(query) + 50)
-                    snippet = content[start:end]
-                    if start > 0:
-                        snippet = "..." + snippet
-                    if end < len(content):
-                        snippet = snippet + "..."
-
-                    rel_path = str(md_file.relative_to(self.vault_path)).replace(".md", "")
-                    results.append((rel_path, str(title), snippet))
+                # Match on raw bytes, streaming so large notes stop at the first hit
+                snippet = _find_snippet(md_file, pattern, max_length)
+                if snippet is None:
+                    continue
+
+                # Get title
+                try:
+                    post = frontmatter.load(md_file)
+                    title = (
+                        post.metadata.get("title")
+                        or post.metadata.get("aliases", [None])[0]
+                        or md_file.stem
+                    )
+                except Exception:
+                    title = md_file.stem
+
+                rel_path = str(md_file.relative_to(self.vault_path)).replace(".md", "")
+                results.append((rel_path, str(title), snippet))
 
             except Exception:
                 continue
@@ -1,25 +1,58 @@
 """Multi-vault manager for handling multiple Obsidian vaults."""
 
-import json
+import asyncio
 import logging
+import os
 import re
 import shutil
+import stat
+import threading
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import orjson
+from cachetools import LRUCache
 from pydantic import BaseModel
 
 from ..core.config import settings
 from ..core.security import decrypt_token, encrypt_token
 from ..models.schemas import FileTreeItem, NoteResponse, VaultInfo
 from .git_service import GitAuthenticationError, GitRepositoryError, GitService, git_service
-from .vault import VaultService
+from .scheduler import vault_scheduler
+from .vault import NOTE_COUNT_TTL, VaultService
 
 logger = logging.getLogger(__name__)
 
+# Worker threads used to count notes across vaults in list_vaults()
+NOTE_COUNT_WORKERS = 8
 
-class VaultConfig(BaseModel):
-    """Configuration for a single vault."""
+# Worker threads used to remove a vault's top-level folders in delete_vault()
+DELETE_WORKERS = 8
+
+# Characters not allowed in generated vault IDs
+_VAULT_ID_SANITIZE_RE = re.compile(r"[^a-z0-9-]")
+
+
+class _PathObjSlot:
+    """Extra slot holding VaultConfig's parsed path, outside its dataclass fields."""
+
+    __slots__ = ("_path_obj",)
+
+
+@dataclass(slots=True)
+class VaultConfig(_PathObjSlot):
+    """Configuration for a single vault.
+
+    A plain slotted dataclass: entries are built from the config file, which
+    is validated on load, or from already-validated API requests. Pydantic
+    still validates and serializes it as a field of VaultsConfiguration.
+    """
 
     path: str
     name: str
@@ -27,6 +60,15 @@ class VaultConfig(BaseModel):
     encrypted_token: str | None = None
     refresh_interval_minutes: int | None = None
 
+    @property
+    def path_obj(self) -> Path:
+        """The vault path as a Path, parsed once per config entry."""
+        try:
+            return self._path_obj
+        except AttributeError:
+            self._path_obj = Path(self.path)
+            return self._path_obj
+
 
 class VaultsConfiguration(BaseModel):
     """Root configuration for all vaults."""
@@ -35,16 +77,135 @@ class VaultsConfiguration(BaseModel):
     default_vault: str | None = None
 
 
+@dataclass(slots=True)
+class VaultEntry:
+    """A configured vault and its service, looked up together by vault ID.
+
+    service is None when the vault's path could not be loaded.
+    """
+
+    config: VaultConfig
+    service: VaultService | None = None
+
+
+# Fields written by _save_config and the JSON types each may hold
+_TRUSTED_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "path": (str,),
+    "name": (str,),
+    "repo_url": (str, type(None)),
+    "encrypted_token": (str, type(None)),
+    "refresh_interval_minutes": (int, type(None)),
+}
+_REQUIRED_FIELDS = frozenset({"path", "name"})
+
+
+def _is_trusted_vault_entry(entry: Any) -> bool:
+    """Check that a raw vault entry has exactly the shape _save_config writes."""
+    return (
+        isinstance(entry, dict)
+        and _REQUIRED_FIELDS <= entry.keys()
+        and all(
+            key in _TRUSTED_FIELD_TYPES and isinstance(value, _TRUSTED_FIELD_TYPES[key])
+            for key, value in entry.items()
+        )
+    )
+
+
+def _load_configuration(config_data: Any) -> VaultsConfiguration:
+    """Build the vault configuration from parsed JSON.
+
+    Data in the shape written by _save_config is assembled directly,
+    skipping pydantic validation. Anything else, such as a
+    hand-edited file with unknown keys or wrong types, is fully validated.
+    """
+    if (
+        isinstance(config_data, dict)
+        and config_data.keys() <= {"vaults", "default_vault"}
+        and isinstance(config_data.get("vaults"), dict)
+        and isinstance(config_data.get("default_vault"), str | None)
+        and all(_is_trusted_vault_entry(entry) for entry in config_data["vaults"].values())
+    ):
+        vaults = {
+            vault_id: VaultConfig(**entry)
+            for vault_id, entry in config_data["vaults"].items()
+        }
+        return VaultsConfiguration.model_construct(
+            vaults=vaults,
+            default_vault=config_data.get("default_vault"),
+        )
+
+    return VaultsConfiguration.model_validate(config_data)
+
+
+class _SessionVaultMap(LRUCache):
+    """LRU session -> vault ID map that also indexes sessions by vault ID.
+
+    Every insert, removal and eviction keeps sessions_by_vault in step, so
+    the sessions using a vault can be found without scanning all sessions.
+    The resolved VaultService per session lives in services and is dropped
+    whenever the session's mapping changes or goes away.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.sessions_by_vault: defaultdict[str, set[str]] = defaultdict(set)
+        self.services: dict[str, VaultService] = {}
+
+    def __setitem__(self, session_id: str, vault_id: str) -> None:
+        if session_id in self:
+            self._unindex(session_id, self[session_id])
+        super().__setitem__(session_id, vault_id)
+        self.sessions_by_vault[vault_id].add(session_id)
+
+    def __delitem__(self, session_id: str) -> None:
+        vault_id = self[session_id]
+        super().__delitem__(session_id)
+        self._unindex(session_id, vault_id)
+
+    def clear(self) -> None:
+        super().clear()
+        self.sessions_by_vault.clear()
+        self.services.clear()
+
+    def _unindex(self, session_id: str, vault_id: str) -> None:
+        self.services.pop(session_id, None)
+        sessions = self.sessions_by_vault.get(vault_id)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self.sessions_by_vault[vault_id]
+
+
 class VaultManager:
     """Manages multiple Obsidian vaults and provides a unified interface."""
 
-    def __init__(self):
+    def __init__(self, max_sessions: int | None = None):
+        """Initialize the vault manager.
+
+        Args:
+            max_sessions: Maximum number of session -> vault mappings to keep.
+                The least recently used sessions are evicted beyond this.
+                Defaults to settings.max_sessions.
+        """
+        if max_sessions is None:
+            max_sessions = settings.max_sessions
         self._initialized = False
-        self._vaults: dict[str, VaultService] = {}
+        # Every configured vault; the persisted document stays in _config
+        self._entries: dict[str, VaultEntry] = {}
         self._config: VaultsConfiguration | None = None
         self._default_vault: str | None = None
-        # Active vault per session (in a real app, this would be per-user session)
-        self._session_vaults: dict[str, str] = {}  # session_id -> vault_id
+        self._config_dir_ensured = False
+        # Serializes config writes from request handlers and scheduler threads
+        self._save_lock = threading.Lock()
+        # Nesting depth of batch() blocks and whether a save was deferred in them
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Last list_vaults() result; counts age out on the same TTL as VaultService
+        self._vault_list: list[VaultInfo] | None = None
+        self._vault_list_at = 0.0
+        # Active vault per session (in a real app, this would be per-user session),
+        # plus the resolved VaultService so hot request paths skip the id lookups
+        self._session_vaults = _SessionVaultMap(maxsize=max_sessions)
         self._git_service: GitService = git_service
 
     async def initialize(self) -> None:
@@ -54,8 +215,15 @@ class VaultManager:
 
         config_path = settings.vaults_config
 
-        if not config_path.exists() or config_path.is_dir():
-            if config_path.is_dir():
+        # One stat call covers the missing, directory and file cases
+        try:
+            config_is_dir = stat.S_ISDIR(os.stat(config_path).st_mode)
+            config_exists = True
+        except FileNotFoundError:
+            config_is_dir = config_exists = False
+
+        if not config_exists or config_is_dir:
+            if config_is_dir:
                 logger.warning(
                     f"Vault configuration path is a directory: {config_path}. "
                     "This can happen if the Docker volume mount target doesn't exist on the host."
@@ -68,36 +236,28 @@ class VaultManager:
             return
 
         try:
-            with open(config_path, encoding="utf-8") as f:
-                config_data = json.load(f)
+            config_data = orjson.loads(config_path.read_bytes())
 
-            self._config = VaultsConfiguration(**config_data)
+            self._config = _load_configuration(config_data)
             self._default_vault = self._config.default_vault
 
-            # Initialize vault services
-            for vault_id, vault_config in self._config.vaults.items():
-                vault_path = Path(vault_config.path)
-                vault_service = VaultService(
-                    vault_id=vault_id,
-                    vault_path=vault_path,
-                    vault_name=vault_config.name,
+            # Initialize vault services concurrently so slow disks overlap
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(self._load_vault, vault_id, vault_config)
+                    for vault_id, vault_config in self._config.vaults.items()
                 )
-
-                if vault_service.validate():
-                    self._vaults[vault_id] = vault_service
-                    logger.info(f"Loaded vault: {vault_config.name} ({vault_id})")
-                else:
-                    logger.warning(
-                        f"Vault path does not exist or is not accessible: {vault_path}"
-                    )
+            )
+            for vault_id, vault_service in results:
+                self._entries[vault_id] = VaultEntry(self._config.vaults[vault_id], vault_service)
 
             self._initialized = True
-            logger.info(f"Vault manager initialized with {len(self._vaults)} vaults")
+            logger.info(f"Vault manager initialized with {len(self._services())} vaults")
 
             # Schedule sync jobs for vaults with refresh intervals
             self._schedule_vault_syncs()
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in vault configuration: {e}")
             self._config = VaultsConfiguration(vaults={}, default_vault=None)
             self._initialized = True
@@ -106,12 +266,31 @@ class VaultManager:
             self._config = VaultsConfiguration(vaults={}, default_vault=None)
             self._initialized = True
 
+    @staticmethod
+    def _load_vault(
+        vault_id: str, vault_config: VaultConfig
+    ) -> tuple[str, VaultService | None]:
+        """Create and validate the service for a single vault.
+
+        Runs in a worker thread during initialization since validation is
+        blocking filesystem I/O.
+        """
+        vault_path = vault_config.path_obj
+        vault_service = VaultService(
+            vault_id=vault_id,
+            vault_path=vault_path,
+            vault_name=vault_config.name,
+        )
+
+        if not vault_service.validate():
+            logger.warning(f"Vault path does not exist or is not accessible: {vault_path}")
+            return vault_id, None
+
+        logger.info(f"Loaded vault: {vault_config.name} ({vault_id})")
+        return vault_id, vault_service
+
     def _schedule_vault_syncs(self) -> None:
         """Schedule sync jobs for vaults with refresh intervals."""
-        # Import here to avoid circular imports
-        from .scheduler import vault_scheduler
-
-        vault_scheduler.set_vault_manager(self)
         vault_scheduler.start()
         vault_scheduler.reschedule_all_vaults()
 
@@ -124,37 +303,75 @@ class VaultManager:
         if not self._config:
             return
 
-        config_path = settings.vaults_config
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
 
-        try:
-            # Handle case where config path is a directory (Docker mount issue)
-            if config_path.is_dir():
-                logger.warning(
-                    f"Config path {config_path} is a directory, removing it to create file"
-                )
-                config_path.rmdir()
+        config_path = settings.vaults_config
 
-            # Create parent directory if needed
-            config_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            try:
+                # The config location only needs preparing before the first write
+                if not self._config_dir_ensured:
+                    # Handle case where config path is a directory (Docker mount issue)
+                    if config_path.is_dir():
+                        logger.warning(
+                            f"Config path {config_path} is a directory, removing it to create file"
+                        )
+                        config_path.rmdir()
+
+                    # Create parent directory if needed
+                    config_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._config_dir_ensured = True
+
+                data = orjson.dumps(self._config.model_dump(), option=orjson.OPT_INDENT_2)
+
+                # Write a sibling temp file and swap it in so the config is never torn
+                tmp_path = config_path.with_name(f"{config_path.name}.tmp")
+                tmp_path.write_bytes(data)
+                try:
+                    os.replace(tmp_path, config_path)
+                except OSError:
+                    # Renaming over a file bind-mounted on its own fails (EBUSY);
+                    # fall back to rewriting it in place
+                    tmp_path.unlink(missing_ok=True)
+                    config_path.write_bytes(data)
+
+                logger.info(f"Saved vault configuration to {config_path}")
 
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(self._config.model_dump(), f, indent=2)
+            except Exception as e:
+                logger.error(f"Failed to save vault configuration: {e}")
+                raise
 
-            logger.info(f"Saved vault configuration to {config_path}")
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Defer configuration saves until the outermost batch exits.
 
-        except Exception as e:
-            logger.error(f"Failed to save vault configuration: {e}")
-            raise
+        Wrap bulk add_vault()/delete_vault() calls in
+        ``async with vault_manager.batch():`` to write the config file once.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._save_config()
 
     def _generate_vault_id(self, name: str) -> str:
         """Generate a unique vault ID from the name."""
         # Sanitize: lowercase, replace spaces with hyphens, remove special chars
-        vault_id = re.sub(r"[^a-z0-9-]", "", name.lower().replace(" ", "-"))
+        vault_id = _VAULT_ID_SANITIZE_RE.sub("", name.lower().replace(" ", "-"))
+
+        # Ensure uniqueness against loaded and configured vaults
+        existing = set(self._entries)
+        if self._config:
+            existing.update(self._config.vaults)
 
-        # Ensure uniqueness
         base_id = vault_id
         counter = 1
-        while vault_id in self._vaults or (self._config and vault_id in self._config.vaults):
+        while vault_id in existing:
             vault_id = f"{base_id}-{counter}"
             counter += 1
 
@@ -237,12 +454,11 @@ class VaultManager:
             vault_path=target_path,
             vault_name=name,
         )
-        self._vaults[vault_id] = vault_service
+        self._entries[vault_id] = VaultEntry(vault_config, vault_service)
+        self.invalidate_vault_list()
 
         # Schedule sync if interval is set
         if refresh_interval_minutes and refresh_interval_minutes > 0:
-            from .scheduler import vault_scheduler
-
             vault_scheduler.schedule_vault_sync(
                 vault_id=vault_id,
                 vault_path=target_path,
@@ -252,13 +468,39 @@ class VaultManager:
 
         logger.info(f"Successfully created vault '{name}' ({vault_id})")
 
-        return VaultInfo(
+        return VaultInfo.model_construct(
             id=vault_id,
             name=name,
             path=str(target_path),
             note_count=vault_service.get_note_count(),
         )
 
+    @staticmethod
+    def _remove_tree(path: Path) -> None:
+        """Remove a directory tree, deleting its top-level folders in parallel.
+
+        Like shutil.rmtree, refuses a symlinked root rather than emptying its target.
+        """
+        if os.path.islink(path):
+            raise OSError(f"Cannot remove a symbolic link as a directory tree: {path}")
+
+        folders: list[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                else:
+                    os.unlink(entry.path)
+
+        if len(folders) > 1:
+            with ThreadPoolExecutor(max_workers=min(DELETE_WORKERS, len(folders))) as executor:
+                # Consume the results so the first failure is raised here
+                list(executor.map(shutil.rmtree, folders))
+        elif folders:
+            shutil.rmtree(folders[0])
+
+        os.rmdir(path)
+
     async def delete_vault(self, vault_id: str, delete_files: bool = True) -> bool:
         """Delete a vault.
 
@@ -272,32 +514,29 @@ class VaultManager:
         Raises:
             ValueError: If vault doesn't exist.
         """
-        if not self._config or vault_id not in self._config.vaults:
+        entry = self._entries.pop(vault_id, None)
+        if entry is None or not self._config:
             raise ValueError(f"Vault '{vault_id}' not found")
 
-        vault_config = self._config.vaults[vault_id]
-        vault_path = Path(vault_config.path)
+        vault_path = entry.config.path_obj
 
         # Remove from scheduler
-        from .scheduler import vault_scheduler
-
         vault_scheduler.remove_vault_sync(vault_id)
 
         # Remove from active vaults
-        if vault_id in self._vaults:
-            del self._vaults[vault_id]
+        if entry.service is not None:
+            self.invalidate_vault_list()
 
         # Remove from session mappings
-        sessions_to_clear = [
-            sid for sid, vid in self._session_vaults.items() if vid == vault_id
-        ]
+        sessions_to_clear = self._session_vaults.sessions_by_vault.pop(vault_id, ())
         for sid in sessions_to_clear:
             del self._session_vaults[sid]
 
         # Delete files if requested
         if delete_files and vault_path.exists():
             try:
-                shutil.rmtree(vault_path)
+                # Large vaults take a while to remove; keep the event loop free
+                await asyncio.to_thread(self._remove_tree, vault_path)
                 logger.info(f"Deleted vault files at {vault_path}")
             except Exception as e:
                 logger.error(f"Failed to delete vault files: {e}")
@@ -329,10 +568,11 @@ class VaultManager:
         Returns:
             Dict with sync result: {"success": bool, "message": str}
         """
-        if not self._config or vault_id not in self._config.vaults:
+        entry = self._entries.get(vault_id)
+        if entry is None:
             return {"success": False, "message": f"Vault '{vault_id}' not found"}
 
-        vault_config = self._config.vaults[vault_id]
+        vault_config = entry.config
 
         if not vault_config.encrypted_token:
             return {"success": False, "message": "Vault has no stored credentials"}
@@ -340,53 +580,81 @@ class VaultManager:
         if not vault_config.repo_url:
             return {"success": False, "message": "Vault is not linked to a repository"}
 
-        from .scheduler import vault_scheduler
-
-        return vault_scheduler.trigger_sync_now(
+        result = vault_scheduler.trigger_sync_now(
             vault_id=vault_id,
-            vault_path=Path(vault_config.path),
+            vault_path=vault_config.path_obj,
             encrypted_token=vault_config.encrypted_token,
         )
 
+        if result["success"] and entry.service:
+            entry.service.invalidate_note_count()
+            entry.service.clear_note_cache()
+            self.invalidate_vault_list()
+
+        return result
+
     def list_vaults(self) -> list[VaultInfo]:
-        """Get list of all available vaults."""
-        vaults: list[VaultInfo] = []
+        """Get list of all available vaults.
 
-        for vault_id, vault_service in self._vaults.items():
-            # Get additional info from config if available
-            has_sync = False
-            if self._config and vault_id in self._config.vaults:
-                cfg = self._config.vaults[vault_id]
-                has_sync = bool(cfg.repo_url and cfg.encrypted_token)
+        The result is reused for NOTE_COUNT_TTL seconds, or until
+        invalidate_vault_list() is called.
+        """
+        now = time.monotonic()
+        if self._vault_list is not None and now - self._vault_list_at < NOTE_COUNT_TTL:
+            return list(self._vault_list)
 
+        vaults: list[VaultInfo] = []
+        services = self._services()
+
+        # Counting notes walks each vault; overlap the walks when there are several
+        if len(services) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(NOTE_COUNT_WORKERS, len(services))
+            ) as executor:
+                note_counts = list(executor.map(VaultService.get_note_count, services))
+        else:
+            note_counts = [service.get_note_count() for service in services]
+
+        # Every field comes from a loaded VaultService, so skip validation
+        for vault_service, note_count in zip(services, note_counts):
             vaults.append(
-                VaultInfo(
-                    id=vault_id,
+                VaultInfo.model_construct(
+                    id=vault_service.vault_id,
                     name=vault_service.vault_name,
                     path=str(vault_service.vault_path),
-                    note_count=vault_service.get_note_count(),
+                    note_count=note_count,
                 )
             )
 
-        return vaults
+        self._vault_list = vaults
+        self._vault_list_at = now
+        return list(vaults)
+
+    def invalidate_vault_list(self) -> None:
+        """Force the next list_vaults() call to rebuild the vault list."""
+        self._vault_list = None
+
+    def _services(self) -> list[VaultService]:
+        """Get the services of all successfully loaded vaults."""
+        return [entry.service for entry in self._entries.values() if entry.service is not None]
 
     def get_default_vault(self) -> str | None:
         """Get the default vault ID."""
-        if self._default_vault and self._default_vault in self._vaults:
+        if self._default_vault and self.get_vault(self._default_vault):
             return self._default_vault
 
         # Fall back to first vault
-        if self._vaults:
-            return next(iter(self._vaults.keys()))
+        for vault_id, entry in self._entries.items():
+            if entry.service is not None:
+                return vault_id
 
         return None
 
     def get_active_vault_id(self, session_id: str) -> str | None:
         """Get the active vault ID for a session."""
-        if session_id in self._session_vaults:
-            vault_id = self._session_vaults[session_id]
-            if vault_id in self._vaults:
-                return vault_id
+        vault_id = self._session_vaults.get(session_id)
+        if vault_id is not None and self.get_vault(vault_id):
+            return vault_id
 
         # Fall back to default and auto-map the session
         default_vault = self.get_default_vault()
@@ -396,21 +664,34 @@ class VaultManager:
 
     def set_active_vault(self, session_id: str, vault_id: str) -> bool:
         """Set the active vault for a session."""
-        if vault_id not in self._vaults:
+        vault = self.get_vault(vault_id)
+        if vault is None:
             return False
 
         self._session_vaults[session_id] = vault_id
+        self._session_vaults.services[session_id] = vault
         return True
 
     def get_vault(self, vault_id: str) -> VaultService | None:
         """Get a specific vault service by ID."""
-        return self._vaults.get(vault_id)
+        entry = self._entries.get(vault_id)
+        return entry.service if entry is not None else None
 
     def get_active_vault(self, session_id: str) -> VaultService | None:
         """Get the active vault service for a session."""
+        vault = self._session_vaults.services.get(session_id)
+        # Only trust a cached service that is still the one registered for its vault
+        if vault is not None and self.get_vault(vault.vault_id) is vault:
+            # Touch the mapping so the session stays recently used
+            self._session_vaults.get(session_id)
+            return vault
+
         vault_id = self.get_active_vault_id(session_id)
         if vault_id:
-            return self._vaults.get(vault_id)
+            vault = self.get_vault(vault_id)
+            if vault is not None:
+                self._session_vaults.services[session_id] = vault
+            return vault
         return None
 
     def get_file_tree(self, session_id: str) -> list[FileTreeItem]:
@@ -446,10 +727,11 @@ class VaultManager:
 
         Returns dict with repo_url, has_token, refresh_interval, or None if vault not found.
         """
-        if not self._config or vault_id not in self._config.vaults:
+        entry = self._entries.get(vault_id)
+        if entry is None:
             return None
 
-        cfg = self._config.vaults[vault_id]
+        cfg = entry.config
         return {
             "repo_url": cfg.repo_url,
             "has_token": bool(cfg.encrypted_token),
@@ -3,9 +3,8 @@
 import asyncio
 import json
 import os
-import tempfile
+import sys
 from pathlib import Path
-from typing import Generator
 
 import pytest
 
@@ -15,10 +14,9 @@ os.environ["APP_PASSWORD"] = "test_password"
 os.environ["ENV"] = "development"
 
 
-@pytest.fixture
-def temp_vault(tmp_path: Path) -> Path:
-    """Create a temporary vault directory with test files."""
-    vault_path = tmp_path / "vault"
+def _create_test_vault(root: Path) -> Path:
+    """Create a vault directory with test files under root."""
+    vault_path = root / "vault"
     vault_path.mkdir()
 
     # Create some test markdown files
@@ -96,68 +94,117 @@ This is a note with dashes and spaces in the filename.
     return vault_path
 
 
+def swap_app_global(monkeypatch: pytest.MonkeyPatch, module, name: str, value) -> None:
+    """Replace module.name with value, along with every copy bound by a `from` import.
+
+    Modules such as routes and main import settings and the service singletons
+    by name, so patching only the defining module would leave them on the old
+    objects. Modules imported later pick up the new value from module itself.
+    """
+    current = getattr(module, name)
+    for module_name, loaded in list(sys.modules.items()):
+        if module_name.startswith("obsidian_reader") and getattr(loaded, name, None) is current:
+            monkeypatch.setattr(loaded, name, value)
+
+
 @pytest.fixture
-def vault_config(temp_vault: Path, tmp_path: Path) -> Path:
+def temp_vault(tmp_path: Path) -> Path:
+    """Create a temporary vault directory with test files."""
+    return _create_test_vault(tmp_path)
+
+
+@pytest.fixture(scope="module")
+def module_vault(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a vault shared by every API test in a module."""
+    return _create_test_vault(tmp_path_factory.mktemp("api"))
+
+
+@pytest.fixture(scope="session")
+def shared_md_service():
+    """Create one markdown service for the whole test session."""
+    from obsidian_reader.services.markdown import MarkdownService
+
+    return MarkdownService(cache_max_size=1000)
+
+
+@pytest.fixture
+def md_service(shared_md_service):
+    """Provide the shared markdown service with an empty render cache."""
+    shared_md_service.clear_cache()
+    return shared_md_service
+
+
+@pytest.fixture(scope="module")
+def vault_config(module_vault: Path) -> Path:
     """Create a vault configuration file."""
     config = {
         "vaults": {
             "test": {
-                "path": str(temp_vault),
+                "path": str(module_vault),
                 "name": "Test Vault"
             }
         },
         "default_vault": "test"
     }
 
-    config_path = tmp_path / "vaults.json"
+    config_path = module_vault.parent / "vaults.json"
     config_path.write_text(json.dumps(config))
 
     return config_path
 
 
-@pytest.fixture
-def test_client(vault_config: Path, tmp_path: Path, temp_vault: Path):
-    """Create a test client with configured vaults."""
+@pytest.fixture(scope="module")
+def app_client(vault_config: Path):
+    """Create a test client with configured vaults, shared within a module."""
     from fastapi.testclient import TestClient
 
-    # Set environment variables BEFORE importing anything
-    data_dir = tmp_path / "data"
+    # Import the app first so its modules' own references get swapped below
+    from obsidian_reader.main import app
+
+    data_dir = vault_config.parent / "data"
     data_dir.mkdir(exist_ok=True)
 
-    os.environ["VAULTS_CONFIG"] = str(vault_config)
-    os.environ["DATA_DIR"] = str(data_dir)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("VAULTS_CONFIG", str(vault_config))
+        monkeypatch.setenv("DATA_DIR", str(data_dir))
 
-    # Now import and reload settings
-    from obsidian_reader.core.config import Settings
+        # Create fresh settings
+        from obsidian_reader.core.config import Settings
+        import obsidian_reader.core.config as config_module
+        swap_app_global(monkeypatch, config_module, "settings", Settings())
 
-    # Create fresh settings
-    import obsidian_reader.core.config as config_module
-    config_module.settings = Settings()
+        # Reset vault manager
+        from obsidian_reader.services.vault_manager import VaultManager
+        import obsidian_reader.services.vault_manager as vm_module
+        swap_app_global(monkeypatch, vm_module, "vault_manager", VaultManager())
 
-    # Reset vault manager
-    from obsidian_reader.services.vault_manager import VaultManager
-    import obsidian_reader.services.vault_manager as vm_module
-    vm_module.vault_manager = VaultManager()
+        # Reset search service, keeping indexes in memory for the module's tests
+        from obsidian_reader.services.search import SearchService
+        import obsidian_reader.services.search as search_module
+        swap_app_global(monkeypatch, search_module, "search_service", SearchService(in_memory=True))
 
-    # Reset search service
-    from obsidian_reader.services.search import SearchService
-    import obsidian_reader.services.search as search_module
-    search_module.search_service = SearchService()
+        # Initialize vault manager synchronously
+        async def init():
+            await vm_module.vault_manager.initialize()
 
-    # Initialize vault manager synchronously
-    async def init():
-        await vm_module.vault_manager.initialize()
+        asyncio.run(init())
 
-    asyncio.run(init())
+        with TestClient(app) as client:
+            yield client
 
-    # Import app AFTER initialization
-    from obsidian_reader.main import app
+        # Cleanup once per module; the in-memory indexes go with their connections
+        search_module.search_service.close_all()
+
+
+@pytest.fixture
+def test_client(app_client):
+    """Provide the shared test client with per-test session state cleared."""
+    from obsidian_reader.services import vault_manager as vm_module
 
-    with TestClient(app) as client:
-        yield client
+    app_client.cookies.clear()
+    vm_module.vault_manager._session_vaults.clear()
 
-    # Cleanup
-    search_module.search_service.close_all()
+    return app_client
 
 
 @pytest.fixture
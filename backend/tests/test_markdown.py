@@ -14,170 +14,91 @@ from obsidian_reader.services.markdown import (
     render_markdown_cached,
 )
 
-
-class TestMarkdownRendering:
-    """Test suite for markdown rendering."""
-
-    def test_basic_markdown(self):
-        """Test basic markdown rendering."""
-        content = "# Heading\n\nParagraph with **bold** and *italic*."
-        html = render_markdown(content)
-
-        assert "<h1" in html
-        assert "Heading" in html
-        assert "<strong>bold</strong>" in html
-        assert "<em>italic</em>" in html
-
-    def test_wiki_links(self):
-        """Test wiki link rendering."""
-        content = "Link to [[Another Note]]."
-        html = render_markdown(content)
-
-        assert 'href="#/note/Another Note"' in html
-        assert 'class="internal-link"' in html
-        assert "Another Note" in html
-
-    def test_wiki_links_with_alias(self):
-        """Test wiki links with display text alias."""
-        content = "Link to [[Another Note|Display Text]]."
-        html = render_markdown(content)
-
-        assert 'href="#/note/Another Note"' in html
-        assert "Display Text" in html
-
-    def test_wiki_links_with_heading(self):
-        """Test wiki links with heading reference."""
-        content = "Link to [[Note#Section]]."
-        html = render_markdown(content)
-
-        assert 'href="#/note/Note?heading=section"' in html
-
-    def test_image_embeds(self):
-        """Test image embed rendering."""
-        content = "![[image.png]]"
-        html = render_markdown(content)
-
-        assert "<img" in html
-        assert 'src="/api/vault/attachment/image.png"' in html
-        assert 'class="embedded-image' in html
-
-    def test_note_embeds(self):
-        """Test note embed rendering."""
-        content = "![[embedded_note]]"
-        html = render_markdown(content)
-
-        assert 'class="embedded-note' in html
-        assert 'data-embed-target="embedded_note"' in html
-
-    def test_tags(self):
-        """Test inline tag rendering."""
-        content = "This has a #test-tag inline."
-        html = render_markdown(content)
-
-        assert 'href="/search?q=tag:test-tag"' in html
-        assert 'class="tag"' in html
-        assert "#test-tag" in html
-
-    def test_nested_tags(self):
-        """Test nested tag rendering."""
-        content = "Nested #parent/child tag."
-        html = render_markdown(content)
-
-        assert "tag:parent/child" in html
-
-    def test_callout_note(self):
-        """Test note callout rendering."""
-        content = """> [!note] Title
-> Content here."""
-        html = render_markdown(content)
-
-        assert 'class="callout callout-note"' in html
-        assert "Title" in html
-        assert "Content here" in html
-
-    def test_callout_warning(self):
-        """Test warning callout rendering."""
-        content = """> [!warning]
-> Be careful!"""
-        html = render_markdown(content)
-
-        assert "callout-warning" in html
-
-    def test_callout_tip(self):
-        """Test tip callout rendering."""
-        content = """> [!tip] Pro Tip
-> This is helpful."""
-        html = render_markdown(content)
-
-        assert "callout-tip" in html
-
-    def test_inline_math(self):
-        """Test inline math rendering."""
-        content = "The equation $E = mc^2$ is famous."
-        html = render_markdown(content)
-
-        assert 'class="math-inline"' in html
-        assert 'data-math="E = mc^2"' in html
-
-    def test_block_math(self):
-        """Test block math rendering."""
-        content = """$$
-\\int_0^\\infty e^{-x^2} dx = \\frac{\\sqrt{\\pi}}{2}
-$$"""
-        html = render_markdown(content)
-
-        assert 'class="math-block"' in html
-
-    def test_code_block(self):
-        """Test fenced code block rendering."""
-        content = """```python
-def hello():
-    print("Hello!")
-```"""
-        html = render_markdown(content)
-
-        assert 'class="code-block"' in html
-
-    def test_task_list(self):
-        """Test task list rendering."""
-        content = """- [ ] Unchecked
-- [x] Checked"""
-        html = render_markdown(content)
-
-        assert 'type="checkbox"' in html
-        assert "checked" in html
-        assert "disabled" in html
-
-    def test_tables(self):
-        """Test table rendering."""
-        content = """| Header 1 | Header 2 |
-| --- | --- |
-| Cell 1 | Cell 2 |"""
-        html = render_markdown(content)
-
-        assert "<table>" in html
-        assert "<th>" in html
-        assert "<td>" in html
-
-    def test_footnotes(self):
-        """Test footnote rendering."""
-        content = """Text with footnote[^1].
-
-[^1]: Footnote content."""
-        html = render_markdown(content)
-
-        assert "footnote" in html.lower()
-
-    def test_external_links(self):
-        """Test external links remain unchanged."""
-        content = "Visit [Google](https://google.com)."
-        html = render_markdown(content)
-
-        assert 'href="https://google.com"' in html
-
-    def test_multiple_features(self):
-        """Test multiple features in one document."""
-        content = """# Mixed Content
+# Stable modification time so cache keys are deterministic across runs
+FIXED_MTIME = datetime(2024, 1, 1, 12, 0, 0)
+
+# (content, substrings expected in the rendered HTML) per Obsidian feature
+RENDERING_CASES = [
+    pytest.param(
+        "# Heading\n\nParagraph with **bold** and *italic*.",
+        ["<h1", "Heading", "<strong>bold</strong>", "<em>italic</em>"],
+        id="basic-markdown",
+    ),
+    pytest.param(
+        "Link to [[Another Note]].",
+        ['href="#/note/Another Note"', 'class="internal-link"', "Another Note"],
+        id="wiki-links",
+    ),
+    pytest.param(
+        "Link to [[Another Note|Display Text]].",
+        ['href="#/note/Another Note"', "Display Text"],
+        id="wiki-links-with-alias",
+    ),
+    pytest.param(
+        "Link to [[Note#Section]].",
+        ['href="#/note/Note?heading=section"'],
+        id="wiki-links-with-heading",
+    ),
+    pytest.param(
+        "![[image.png]]",
+        ["<img", 'src="/api/vault/attachment/image.png"', 'class="embedded-image'],
+        id="image-embeds",
+    ),
+    pytest.param(
+        "![[embedded_note]]",
+        ['class="embedded-note', 'data-embed-target="embedded_note"'],
+        id="note-embeds",
+    ),
+    pytest.param(
+        "This has a #test-tag inline.",
+        ['href="/search?q=tag:test-tag"', 'class="tag"', "#test-tag"],
+        id="tags",
+    ),
+    pytest.param("Nested #parent/child tag.", ["tag:parent/child"], id="nested-tags"),
+    pytest.param(
+        "> [!note] Title\n> Content here.",
+        ['class="callout callout-note"', "Title", "Content here"],
+        id="callout-note",
+    ),
+    pytest.param("> [!warning]\n> Be careful!", ["callout-warning"], id="callout-warning"),
+    pytest.param("> [!tip] Pro Tip\n> This is helpful.", ["callout-tip"], id="callout-tip"),
+    pytest.param(
+        "The equation $E = mc^2$ is famous.",
+        ['class="math-inline"', 'data-math="E = mc^2"'],
+        id="inline-math",
+    ),
+    pytest.param(
+        "$$\n\\int_0^\\infty e^{-x^2} dx = \\frac{\\sqrt{\\pi}}{2}\n$$",
+        ['class="math-block"'],
+        id="block-math",
+    ),
+    pytest.param(
+        '```python\ndef hello():\n    print("Hello!")\n```',
+        ['class="code-block"'],
+        id="code-block",
+    ),
+    pytest.param(
+        "- [ ] Unchecked\n- [x] Checked",
+        ['type="checkbox"', "checked", "disabled"],
+        id="task-list",
+    ),
+    pytest.param(
+        "| Header 1 | Header 2 |\n| --- | --- |\n| Cell 1 | Cell 2 |",
+        ["<table>", "<th>", "<td>"],
+        id="tables",
+    ),
+    pytest.param(
+        "Text with footnote[^1].\n\n[^1]: Footnote content.",
+        ["footnote"],
+        id="footnotes",
+    ),
+    pytest.param(
+        "Visit [Google](https://google.com).",
+        ['href="https://google.com"'],
+        id="external-links",
+    ),
+    pytest.param(
+        """# Mixed Content
 
 This has [[wiki links]], #tags, and $math$.
 
@@ -187,14 +108,23 @@ This has [[wiki links]], #tags, and $math$.
 ```python
 code()
 ```
-"""
-        html = render_markdown(content)
+""",
+        ["internal-link", "tag", "math-inline", "callout", "code-block"],
+        id="multiple-features",
+    ),
+]
 
-        assert "internal-link" in html
-        assert "tag" in html
-        assert "math-inline" in html
-        assert "callout" in html
-        assert "code-block" in html
+
+class TestMarkdownRendering:
+    """Test suite for markdown rendering."""
+
+    @pytest.mark.parametrize(("content", "expected"), RENDERING_CASES)
+    def test_rendering(self, md_service: MarkdownService, content: str, expected: list[str]):
+        """Test that each Obsidian feature renders to the expected HTML."""
+        html = md_service.render(content)
+
+        for substring in expected:
+            assert substring in html
 
 
 class TestMarkdownCache:
@@ -205,7 +135,7 @@ class TestMarkdownCache:
         cache = MarkdownCache(max_size=100)
         vault_id = "test_vault"
         note_path = "test/note.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
         html_content = "<h1>Test</h1>"
 
         # Initially cache should be empty
@@ -223,7 +153,7 @@ class TestMarkdownCache:
         cache = MarkdownCache(max_size=100)
         vault_id = "test_vault"
         note_path = "test/note.md"
-        old_mtime = datetime.now()
+        old_mtime = FIXED_MTIME
         new_mtime = old_mtime + timedelta(seconds=1)
         html_content = "<h1>Test</h1>"
 
@@ -238,7 +168,7 @@ class TestMarkdownCache:
         """Test that different vaults have separate cache entries."""
         cache = MarkdownCache(max_size=100)
         note_path = "same/note.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Cache for vault A
         cache.set("vault_a", note_path, modified_at, "<h1>Vault A</h1>")
@@ -253,7 +183,7 @@ class TestMarkdownCache:
         cache = MarkdownCache(max_size=100)
         vault_id = "test_vault"
         note_path = "test/note.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Initial stats
         stats = cache.get_stats()
@@ -286,7 +216,7 @@ class TestMarkdownCache:
         """Test cache clearing."""
         cache = MarkdownCache(max_size=100)
         vault_id = "test_vault"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Add some entries
         for i in range(5):
@@ -305,7 +235,7 @@ class TestMarkdownCache:
         """Test LRU eviction when cache is full."""
         cache = MarkdownCache(max_size=3)
         vault_id = "test_vault"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Fill cache
         cache.set(vault_id, "note_1.md", modified_at, "<h1>1</h1>")
@@ -337,29 +267,27 @@ class TestMarkdownCache:
 class TestMarkdownServiceCaching:
     """Test suite for MarkdownService caching integration."""
 
-    def test_render_cached_stores_and_retrieves(self):
+    def test_render_cached_stores_and_retrieves(self, md_service: MarkdownService):
         """Test that render_cached stores and retrieves from cache."""
-        service = MarkdownService(cache_max_size=100)
         content = "# Test Heading"
         vault_id = "test_vault"
         note_path = "test.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # First call should render and cache
-        html1 = service.render_cached(content, vault_id, note_path, modified_at)
-        stats1 = service.get_cache_stats()
+        html1 = md_service.render_cached(content, vault_id, note_path, modified_at)
+        stats1 = md_service.get_cache_stats()
         assert stats1.misses == 1
         assert stats1.size == 1
 
         # Second call should hit cache
-        html2 = service.render_cached(content, vault_id, note_path, modified_at)
-        stats2 = service.get_cache_stats()
+        html2 = md_service.render_cached(content, vault_id, note_path, modified_at)
+        stats2 = md_service.get_cache_stats()
         assert stats2.hits == 1
         assert html1 == html2
 
-    def test_render_cached_vs_uncached_consistency(self):
+    def test_render_cached_vs_uncached_consistency(self, md_service: MarkdownService):
         """Test that cached and uncached rendering produce same output."""
-        service = MarkdownService(cache_max_size=100)
         content = """# Test
 
 This has [[wiki links]] and #tags.
@@ -369,37 +297,39 @@ This has [[wiki links]] and #tags.
 """
         vault_id = "test_vault"
         note_path = "test.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Uncached render
-        html_uncached = service.render(content)
+        html_uncached = md_service.render(content)
 
         # Cached render
-        html_cached = service.render_cached(content, vault_id, note_path, modified_at)
+        html_cached = md_service.render_cached(content, vault_id, note_path, modified_at)
 
         assert html_uncached == html_cached
 
-    def test_service_clear_cache(self):
+    def test_service_clear_cache(self, md_service: MarkdownService):
         """Test MarkdownService cache clearing."""
-        service = MarkdownService(cache_max_size=100)
         content = "# Test"
         vault_id = "test_vault"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         # Add to cache
-        service.render_cached(content, vault_id, "test.md", modified_at)
-        assert service.get_cache_stats().size == 1
+        md_service.render_cached(content, vault_id, "test.md", modified_at)
+        assert md_service.get_cache_stats().size == 1
 
         # Clear
-        service.clear_cache()
-        assert service.get_cache_stats().size == 0
+        md_service.clear_cache()
+        assert md_service.get_cache_stats().size == 0
 
 
 class TestGlobalCacheFunctions:
     """Test suite for global cache functions."""
 
-    def setup_method(self):
-        """Clear cache before each test."""
+    @pytest.fixture(autouse=True)
+    def _clear_global_cache(self):
+        """Clear the global cache around each test so entries don't leak."""
+        clear_cache()
+        yield
         clear_cache()
 
     def test_render_markdown_cached_global(self):
@@ -407,7 +337,7 @@ class TestGlobalCacheFunctions:
         content = "# Test"
         vault_id = "test_vault"
         note_path = "test.md"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         html = render_markdown_cached(content, vault_id, note_path, modified_at)
         assert "<h1" in html
@@ -416,11 +346,18 @@ class TestGlobalCacheFunctions:
         stats = get_cache_stats()
         assert stats.size == 1
 
+    def test_render_markdown_global(self):
+        """Test global render_markdown function bypasses the cache."""
+        html = render_markdown("# Test")
+
+        assert "<h1" in html
+        assert get_cache_stats().size == 0
+
     def test_global_clear_cache(self):
         """Test global clear_cache function."""
         content = "# Test"
         vault_id = "test_vault"
-        modified_at = datetime.now()
+        modified_at = FIXED_MTIME
 
         render_markdown_cached(content, vault_id, "test.md", modified_at)
         assert get_cache_stats().size == 1
@@ -4,13 +4,12 @@ These tests verify behavior that only occurs in production mode,
 such as static file serving for the SPA frontend.
 """
 
-import os
-import sys
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
+from .conftest import swap_app_global
+
 
 class TestStaticPathCalculation:
     """Test suite for static path calculation.
@@ -31,19 +30,19 @@ class TestStaticPathCalculation:
         """
         from obsidian_reader import main
         
-        main_file = Path(main.__file__)
+        parts = Path(main.__file__).parts
         
-        # Calculate the path as it's done in production
-        static_path = main_file.parent.parent.parent / "static"
+        # Calculate the path as it's done in production (3 parents up)
+        static_path = Path(*parts[:-3], "static")
         
         # Verify the path structure is correct
         # main.py should be in obsidian_reader/
-        assert main_file.parent.name == "obsidian_reader"
+        assert parts[-2] == "obsidian_reader"
         # obsidian_reader/ should be in src/
-        assert main_file.parent.parent.name == "src"
+        assert parts[-3] == "src"
         # static should be a sibling of src/
         assert static_path.name == "static"
-        assert static_path.parent == main_file.parent.parent.parent
+        assert static_path.parts[:-1] == parts[:-3]
 
     def test_static_path_is_not_root_directory(self):
         """Ensure static path doesn't accidentally resolve to filesystem root.
@@ -53,8 +52,8 @@ class TestStaticPathCalculation:
         """
         from obsidian_reader import main
         
-        main_file = Path(main.__file__)
-        static_path = main_file.parent.parent.parent / "static"
+        parts = Path(main.__file__).parts
+        static_path = Path(*parts[:-3], "static")
         
         # The static path should never be at the filesystem root
         assert static_path.parent != Path("/")
@@ -67,19 +66,125 @@ class TestStaticPathCalculation:
         """
         from obsidian_reader import main
         
-        main_file = Path(main.__file__)
+        parts = Path(main.__file__).parts
         
         # The correct path uses 3 parents
-        correct_path = main_file.parent.parent.parent / "static"
+        correct_parts = parts[:-3]
         
         # The incorrect path (bug) used 4 parents
-        incorrect_path = main_file.parent.parent.parent.parent / "static"
+        incorrect_parts = parts[:-4]
         
         # These should be different
-        assert correct_path != incorrect_path
+        assert correct_parts != incorrect_parts
         
         # The incorrect path would be closer to root
-        assert len(incorrect_path.parts) < len(correct_path.parts)
+        assert len(incorrect_parts) < len(correct_parts)
+
+
+@pytest.fixture(scope="class")
+def production_env(tmp_path_factory):
+    """Set up production environment with mock static files."""
+    # Create mock static directory structure
+    static_dir = tmp_path_factory.mktemp("production") / "static"
+    static_dir.mkdir()
+    
+    assets_dir = static_dir / "assets"
+    assets_dir.mkdir()
+    
+    # Create mock files
+    index_html = static_dir / "index.html"
+    index_html.write_text("<!DOCTYPE html><html><body>Test SPA</body></html>")
+    
+    favicon = static_dir / "favicon.svg"
+    favicon.write_text("<svg></svg>")
+    
+    js_file = assets_dir / "index.js"
+    js_file.write_text("console.log('test');")
+    
+    css_file = assets_dir / "index.css"
+    css_file.write_text("body { margin: 0; }")
+    
+    return static_dir
+
+
+@pytest.fixture(scope="class")
+def production_app(production_env):
+    """Create a production mode FastAPI app with static files, shared by the class."""
+    import json
+    
+    tmp_path = production_env.parent
+    
+    # Create vault config
+    vault_path = tmp_path / "vault"
+    vault_path.mkdir()
+    (vault_path / "test.md").write_text("# Test\n\nTest content.")
+    
+    config = {
+        "vaults": {
+            "test": {"path": str(vault_path), "name": "Test Vault"}
+        },
+        "default_vault": "test"
+    }
+    config_path = tmp_path / "vaults.json"
+    config_path.write_text(json.dumps(config))
+    
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Set production environment; restored when the class is done
+        monkeypatch.setenv("ENV", "production")
+        monkeypatch.setenv("VAULTS_CONFIG", str(config_path))
+        monkeypatch.setenv("DATA_DIR", str(data_dir))
+        monkeypatch.setenv("APP_PASSWORD", "test_password")
+    
+        # For this test, we'll manually create an app that serves static files
+        from fastapi import FastAPI
+        from fastapi.staticfiles import StaticFiles
+        from fastapi.responses import FileResponse
+        from obsidian_reader.api.routes import router as api_router
+    
+        # Swap in production settings without re-importing the package,
+        # including the copies routes and main bound when imported
+        from obsidian_reader.core.config import Settings
+        import obsidian_reader.core.config as config_module
+        swap_app_global(monkeypatch, config_module, "settings", Settings())
+    
+        # Verify we're in production mode
+        assert config_module.settings.is_development is False
+    
+        app = FastAPI()
+        app.include_router(api_router, prefix="/api")
+    
+        # Mount static files like production does
+        if production_env.exists():
+            app.mount(
+                "/assets",
+                StaticFiles(directory=production_env / "assets"),
+                name="assets"
+            )
+        
+            @app.get("/{full_path:path}")
+            async def serve_spa(full_path: str):
+                file_path = production_env / full_path
+                if file_path.exists() and file_path.is_file():
+                    return FileResponse(file_path)
+                return FileResponse(production_env / "index.html")
+    
+        # Initialize the vault manager on app startup, as main.py does, so
+        # it runs on the client's event loop instead of a separate one
+        from obsidian_reader.services.vault_manager import VaultManager
+        import obsidian_reader.services.vault_manager as vm_module
+        swap_app_global(monkeypatch, vm_module, "vault_manager", VaultManager())
+    
+        @app.on_event("startup")
+        async def initialize_vaults():
+            await vm_module.vault_manager.initialize()
+    
+        from fastapi.testclient import TestClient
+    
+        with TestClient(app) as client:
+            yield client
 
 
 class TestProductionStaticFileServing:
@@ -89,149 +194,6 @@ class TestProductionStaticFileServing:
     serving works correctly.
     """
 
-    @pytest.fixture
-    def production_env(self, tmp_path):
-        """Set up production environment with mock static files."""
-        # Create mock static directory structure
-        static_dir = tmp_path / "static"
-        static_dir.mkdir()
-        
-        assets_dir = static_dir / "assets"
-        assets_dir.mkdir()
-        
-        # Create mock files
-        index_html = static_dir / "index.html"
-        index_html.write_text("<!DOCTYPE html><html><body>Test SPA</body></html>")
-        
-        favicon = static_dir / "favicon.svg"
-        favicon.write_text("<svg></svg>")
-        
-        js_file = assets_dir / "index.js"
-        js_file.write_text("console.log('test');")
-        
-        css_file = assets_dir / "index.css"
-        css_file.write_text("body { margin: 0; }")
-        
-        return static_dir
-
-    @pytest.fixture
-    def production_app(self, production_env, tmp_path):
-        """Create a production mode FastAPI app with static files."""
-        import asyncio
-        import json
-        
-        # Create vault config
-        vault_path = tmp_path / "vault"
-        vault_path.mkdir()
-        (vault_path / "test.md").write_text("# Test\n\nTest content.")
-        
-        config = {
-            "vaults": {
-                "test": {"path": str(vault_path), "name": "Test Vault"}
-            },
-            "default_vault": "test"
-        }
-        config_path = tmp_path / "vaults.json"
-        config_path.write_text(json.dumps(config))
-        
-        data_dir = tmp_path / "data"
-        data_dir.mkdir()
-        
-        # Store original environment
-        original_env = os.environ.get("ENV")
-        original_vaults = os.environ.get("VAULTS_CONFIG")
-        original_data = os.environ.get("DATA_DIR")
-        original_password = os.environ.get("APP_PASSWORD")
-        
-        # Set production environment
-        os.environ["ENV"] = "production"
-        os.environ["VAULTS_CONFIG"] = str(config_path)
-        os.environ["DATA_DIR"] = str(data_dir)
-        os.environ["APP_PASSWORD"] = "test_password"
-        
-        # Clear cached modules to force reload with new settings
-        modules_to_remove = [
-            key for key in sys.modules.keys()
-            if key.startswith("obsidian_reader")
-        ]
-        for mod in modules_to_remove:
-            del sys.modules[mod]
-        
-        # Patch the static path calculation to use our test directory
-        with patch("obsidian_reader.main.Path") as MockPath:
-            # Make Path behave normally except for __file__ parent chain
-            MockPath.side_effect = lambda x: Path(x)
-            
-            # Import fresh with production settings
-            from obsidian_reader.core.config import Settings
-            import obsidian_reader.core.config as config_module
-            config_module.settings = Settings()
-            
-            # Verify we're in production mode
-            assert config_module.settings.is_development is False
-            
-            # For this test, we'll manually create an app that serves static files
-            from fastapi import FastAPI
-            from fastapi.staticfiles import StaticFiles
-            from fastapi.responses import FileResponse
-            from obsidian_reader.api.routes import router as api_router
-            
-            app = FastAPI()
-            app.include_router(api_router, prefix="/api")
-            
-            # Mount static files like production does
-            if production_env.exists():
-                app.mount(
-                    "/assets",
-                    StaticFiles(directory=production_env / "assets"),
-                    name="assets"
-                )
-                
-                @app.get("/{full_path:path}")
-                async def serve_spa(full_path: str):
-                    file_path = production_env / full_path
-                    if file_path.exists() and file_path.is_file():
-                        return FileResponse(file_path)
-                    return FileResponse(production_env / "index.html")
-            
-            # Initialize vault manager
-            from obsidian_reader.services.vault_manager import VaultManager
-            import obsidian_reader.services.vault_manager as vm_module
-            vm_module.vault_manager = VaultManager()
-            asyncio.run(vm_module.vault_manager.initialize())
-            
-            from fastapi.testclient import TestClient
-            
-            with TestClient(app) as client:
-                yield client
-        
-        # Restore environment
-        if original_env is not None:
-            os.environ["ENV"] = original_env
-        elif "ENV" in os.environ:
-            del os.environ["ENV"]
-            
-        if original_vaults is not None:
-            os.environ["VAULTS_CONFIG"] = original_vaults
-        elif "VAULTS_CONFIG" in os.environ:
-            del os.environ["VAULTS_CONFIG"]
-            
-        if original_data is not None:
-            os.environ["DATA_DIR"] = original_data
-        elif "DATA_DIR" in os.environ:
-            del os.environ["DATA_DIR"]
-            
-        if original_password is not None:
-            os.environ["APP_PASSWORD"] = original_password
-        
-        # Clear modules again for next tests
-        modules_to_remove = [
-            key for key in sys.modules.keys()
-            if key.startswith("obsidian_reader")
-        ]
-        for mod in modules_to_remove:
-            del sys.modules[mod]
-
     def test_root_serves_index_html(self, production_app):
         """Test that root path serves index.html in production."""
         response = production_app.get("/")
@@ -268,6 +230,43 @@ class TestProductionStaticFileServing:
         assert response.json()["status"] == "healthy"
 
 
+class TestProductionStartup:
+    """Test suite for the app's startup hook."""
+
+    def test_vault_manager_initialized_on_startup(self, tmp_path, monkeypatch):
+        """Test that startup initializes the vault manager in place at that time."""
+        from unittest.mock import AsyncMock, MagicMock
+        
+        from fastapi.testclient import TestClient
+        
+        import obsidian_reader.core.config as config_module
+        import obsidian_reader.services.search as search_module
+        import obsidian_reader.services.vault_manager as vm_module
+        from obsidian_reader.core.config import Settings
+        from obsidian_reader.main import app
+        from obsidian_reader.services.scheduler import vault_scheduler
+        from obsidian_reader.services.search import SearchService
+        from obsidian_reader.services.vault_manager import VaultManager
+        
+        monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+        swap_app_global(monkeypatch, config_module, "settings", Settings())
+        manager = MagicMock(spec=VaultManager)
+        manager.initialize = AsyncMock()
+        manager.list_vaults.return_value = []
+        swap_app_global(monkeypatch, vm_module, "vault_manager", manager)
+        swap_app_global(
+            monkeypatch, search_module, "search_service", SearchService(in_memory=True)
+        )
+        set_vault_manager = MagicMock()
+        monkeypatch.setattr(vault_scheduler, "set_vault_manager", set_vault_manager)
+        
+        with TestClient(app):
+            pass
+        
+        manager.initialize.assert_awaited_once()
+        set_vault_manager.assert_called_once_with(manager)
+
+
 class TestProductionLogging:
     """Test suite for production logging behavior."""
 
@@ -291,4 +290,3 @@ class TestProductionLogging:
         
         assert "Static files directory not found" in caplog.text
         assert str(missing_path) in caplog.text
-
@@ -1,10 +1,16 @@
 """Tests for search functionality."""
 
-import tempfile
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from obsidian_reader.services import search as search_module
 from obsidian_reader.services.search import SearchIndex, SearchService
 
 
@@ -19,6 +25,19 @@ class TestSearchIndex:
 
         assert index.db_path.exists()
 
+    def test_initialize_wal_mode(self, temp_vault: Path, tmp_path: Path):
+        """Test that the index database uses write-ahead logging."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+        index.close()
+
+        conn = sqlite3.connect(tmp_path / "test.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
     def test_build_index(self, temp_vault: Path, tmp_path: Path):
         """Test building search index."""
         index = SearchIndex("test", temp_vault)
@@ -28,6 +47,116 @@ class TestSearchIndex:
         count = index.build_index()
         assert count == 4  # 4 markdown files in temp_vault
 
+        # The optimized index still answers queries
+        results = index.search("callout")
+        assert any(r.path == "test_note" for r in results)
+
+    def test_build_index_skips_symlinked_folders(self, temp_vault: Path, tmp_path: Path):
+        """Test that the vault walk doesn't descend into symlinked folders."""
+        (temp_vault / "loop").symlink_to(temp_vault, target_is_directory=True)
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+
+        assert index.build_index() == 4
+
+    def test_build_index_batch_size(self, temp_vault: Path, tmp_path: Path):
+        """Test that batching inserts doesn't change what gets indexed."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+
+        with patch.object(SearchIndex, "BATCH_SIZE", 1):
+            count = index.build_index()
+
+        assert count == 4
+        rows = index._get_connection().execute("SELECT COUNT(*) FROM notes_fts").fetchone()
+        assert rows[0] == 4
+        assert any(r.path == "test_note" for r in index.search("callout"))
+
+    def test_build_index_parallel(self, temp_vault: Path, tmp_path: Path):
+        """Test building the index with notes parsed in worker processes."""
+        (temp_vault / "broken.md").write_text("---\ntitle: [unclosed\n---\nBody")
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+
+        count = index.build_index_parallel(workers=2)
+
+        # The note with invalid frontmatter is skipped, as in build_index
+        assert count == 4
+        assert any(r.path == "test_note" for r in index.search("callout"))
+        assert [r.path for r in index.search("tag:example")] == ["test_note"]
+
+    def test_build_index_goes_parallel_for_large_vaults(self, temp_vault: Path, tmp_path: Path):
+        """Test that build_index hands large vaults to the process pool."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+
+        with patch.object(index, "_build_parallel", return_value=4) as build_parallel:
+            with patch.object(search_module, "PARALLEL_BUILD_MIN_NOTES", 5):
+                index.build_index()
+            build_parallel.assert_not_called()
+
+            with patch.object(search_module, "PARALLEL_BUILD_MIN_NOTES", 4):
+                assert index.build_index() == 4
+            build_parallel.assert_called_once()
+
+    def test_incremental_update(self, temp_vault: Path, tmp_path: Path):
+        """Test that an incremental update only re-indexes changed notes."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+        index.build_index()
+
+        # Nothing changed since the build
+        assert index.incremental_update() == 0
+
+        # Edit one note, pushing its mtime past the recorded high-water mark
+        edited = temp_vault / "Another Note.md"
+        edited.write_text("# Another Note\n\nNow mentions zeppelins.")
+        future_ns = os.stat(edited).st_mtime_ns + 60_000_000_000
+        os.utime(edited, ns=(future_ns, future_ns))
+        (temp_vault / "subfolder" / "nested_note.md").unlink()
+
+        with patch.object(index, "_parse_note", wraps=index._parse_note) as parse_note:
+            assert index.incremental_update() == 1
+        assert [c.args[0] for c in parse_note.call_args_list] == [edited]
+
+        assert [r.path for r in index.search("zeppelins")] == ["Another Note"]
+        conn = index._get_connection()
+        paths = {row[0] for row in conn.execute("SELECT path FROM notes_fts")}
+        assert paths == {"test_note", "Another Note", "subfolder/note-with-dashes - test 1"}
+        # Tag rows of replaced and removed notes go with them
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM tag_index WHERE note_rowid NOT IN (SELECT rowid FROM notes_fts)"
+        ).fetchone()[0]
+        assert orphans == 0
+        # Each note's bookkeeping row points at its current rowid
+        files = dict(conn.execute("SELECT path, note_rowid FROM note_files").fetchall())
+        assert files == dict(conn.execute("SELECT path, rowid FROM notes_fts").fetchall())
+
+    def test_concurrent_builds_are_serialized(self, temp_vault: Path, tmp_path: Path):
+        """Test that builds from several threads take turns on the writer connection."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+
+        def slow_parse(md_file: Path):
+            # Keep each build's transaction open long enough for the others to collide
+            time.sleep(0.01)
+            return search_module._parse_note_file(md_file, temp_vault)
+
+        with patch.object(index, "_parse_note", side_effect=slow_parse):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                counts = list(executor.map(lambda _: index.build_index(), range(4)))
+
+        assert counts == [4, 4, 4, 4]
+        conn = index._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM notes_fts").fetchone()[0] == 4
+        assert conn.execute("SELECT COUNT(*) FROM note_files").fetchone()[0] == 4
+
     def test_search_basic(self, temp_vault: Path, tmp_path: Path):
         """Test basic search."""
         index = SearchIndex("test", temp_vault)
@@ -50,7 +179,7 @@ class TestSearchIndex:
         assert len(results) >= 1
 
     def test_search_by_tag(self, temp_vault: Path, tmp_path: Path):
-        """Test searching by tag."""
+        """Test searching by tag via a lookup in the tag_index table."""
         index = SearchIndex("test", temp_vault)
         index.db_path = tmp_path / "test.db"
         index.initialize()
@@ -59,6 +188,37 @@ class TestSearchIndex:
         results = index.search("tag:test")
         assert len(results) >= 1
 
+    def test_search_by_tag_uses_tag_index(self, temp_vault: Path, tmp_path: Path):
+        """Test that tag queries match exact and nested tags from the tag index."""
+        (temp_vault / "Project.md").write_text("# Project\n\nFiled under #Work/Client.")
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+        index.build_index()
+
+        conn = index._get_connection()
+        tags = {row[0] for row in conn.execute("SELECT tag FROM tag_index")}
+        assert {"test", "example", "inline-tag", "work/client"} <= tags
+
+        assert [r.path for r in index.search("tag:work")] == ["Project"]
+        assert [r.path for r in index.search("tag:work/client")] == ["Project"]
+        # Only whole path segments nest, and stemming doesn't apply to tags
+        assert index.search("tag:wor") == []
+        assert index.search("tag:client") == []
+        assert index.search("tag:tests") == []
+
+    def test_search_by_tag_normalizes_name(self, temp_vault: Path, tmp_path: Path):
+        """Test that tag_index lookups drop a leading # and take odd names literally."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+        index.build_index()
+
+        assert [r.path for r in index.search("tag:#inline-tag")] == ["test_note"]
+        with patch.object(index, "_simple_search") as simple_search:
+            assert index.search('tag:"unknown') == []
+        simple_search.assert_not_called()
+
     def test_search_no_results(self, temp_vault: Path, tmp_path: Path):
         """Test search with no results."""
         index = SearchIndex("test", temp_vault)
@@ -79,6 +239,8 @@ class TestSearchIndex:
         results = index.search("important")
         assert len(results) >= 1
         assert results[0].snippet  # Should have a snippet
+        # Built by FTS5's snippet() with the match highlighted
+        assert "<mark>" in results[0].snippet
 
     def test_close(self, temp_vault: Path, tmp_path: Path):
         """Test closing the index."""
@@ -89,50 +251,143 @@ class TestSearchIndex:
         index.close()
         assert index._connection is None
 
+    def test_search_uses_read_only_connection(self, temp_vault: Path, tmp_path: Path):
+        """Test that searches run on a separate read-only connection."""
+        index = SearchIndex("test", temp_vault)
+        index.db_path = tmp_path / "test.db"
+        index.initialize()
+        index.build_index()
+
+        assert index.search("callout")
+        read_conn = index._get_read_connection()
+        assert read_conn is not index._connection
+        with pytest.raises(sqlite3.OperationalError):
+            read_conn.execute("DELETE FROM notes_fts")
+
+        index.close()
+        assert index._read_connections == []
+
 
 class TestSearchService:
     """Test suite for SearchService."""
 
-    def test_get_or_create_index(self, temp_vault: Path, tmp_path: Path):
-        """Test getting or creating an index."""
-        import os
-        os.environ["DATA_DIR"] = str(tmp_path)
+    @pytest.fixture(autouse=True)
+    def data_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Keep on-disk indexes created through the service under tmp_path."""
+        monkeypatch.setattr(search_module.settings, "data_dir", tmp_path)
+        return tmp_path
 
+    def test_get_or_create_index(self, temp_vault: Path, data_dir: Path):
+        """Test getting or creating an index."""
         service = SearchService()
         index = service.get_or_create_index("test", temp_vault)
 
         assert index is not None
         assert "test" in service._indexes
+        assert (data_dir / "test.db").exists()
 
     def test_build_index(self, temp_vault: Path, tmp_path: Path):
         """Test building index through service."""
-        import os
-        os.environ["DATA_DIR"] = str(tmp_path)
-
         service = SearchService()
         count = service.build_index("test", temp_vault)
 
         assert count == 4
 
+    def test_build_indexes(self, temp_vault: Path, tmp_path: Path):
+        """Test building several vault indexes concurrently."""
+        other_vault = tmp_path / "other"
+        other_vault.mkdir()
+        (other_vault / "solo.md").write_text("# Solo\n\nA lonely callout.")
+
+        service = SearchService(in_memory=True)
+        counts = service.build_indexes({"test": temp_vault, "other": other_vault})
+
+        assert counts == {"test": 4, "other": 1}
+        assert [r.path for r in service.search("other", other_vault, "lonely")] == ["solo"]
+        assert service.search("test", temp_vault, "callout")
+        service.close_all()
+
+    def test_build_indexes_splits_worker_processes(self, temp_vault: Path, tmp_path: Path):
+        """Test that concurrent vault builds share the CPUs between their process pools."""
+        other_vault = tmp_path / "other"
+        other_vault.mkdir()
+
+        service = SearchService(in_memory=True)
+        with patch.object(search_module.os, "cpu_count", return_value=8):
+            with patch.object(SearchIndex, "build_index", return_value=0) as build_index:
+                service.build_indexes({"test": temp_vault, "other": other_vault})
+
+        assert [c.args for c in build_index.call_args_list] == [(4,), (4,)]
+        service.close_all()
+
     def test_search(self, temp_vault: Path, tmp_path: Path):
         """Test searching through service."""
-        import os
-        os.environ["DATA_DIR"] = str(tmp_path)
-
         service = SearchService()
         service.build_index("test", temp_vault)
 
         results = service.search("test", temp_vault, "callout")
         assert len(results) >= 1
 
+        # A repeated query is answered from the result cache
+        with patch.object(SearchIndex, "search") as index_search:
+            assert service.search("test", temp_vault, "callout") == results
+        index_search.assert_not_called()
+
+        # Rebuilding the index invalidates cached results
+        service.build_index("test", temp_vault)
+        with patch.object(SearchIndex, "search", return_value=[]) as index_search:
+            assert service.search("test", temp_vault, "callout") == []
+        index_search.assert_called_once()
+
+        service.cache_clear()
+        assert len(service._results) == 0
+
+    def test_concurrent_update_and_build(self, temp_vault: Path, tmp_path: Path):
+        """Test that an update and a rebuild of one vault can run at the same time."""
+        service = SearchService()
+        barrier = threading.Barrier(2)
+        created = []
+
+        def create_index(*args, **kwargs):
+            index = SearchIndex(*args, **kwargs)
+            created.append(index)
+            return index
+
+        def run(action):
+            barrier.wait()
+            return action("test", temp_vault)
+
+        # Both calls race to create the vault's index as well as to write to it
+        with patch.object(search_module, "SearchIndex", side_effect=create_index):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                update = executor.submit(run, service.update_index)
+                build = executor.submit(run, service.build_index)
+                # The update does the first build, or finds nothing left to do
+                assert update.result() in (0, 4)
+                assert build.result() == 4
+
+        assert len(created) == 1
+        conn = service._indexes["test"]._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM notes_fts").fetchone()[0] == 4
+        assert conn.execute("SELECT COUNT(*) FROM note_files").fetchone()[0] == 4
+        assert conn.execute("SELECT COUNT(DISTINCT note_rowid) FROM tag_index").fetchone()[0] == 1
+        service.close_all()
+
     def test_close_all(self, temp_vault: Path, tmp_path: Path):
         """Test closing all indexes."""
-        import os
-        os.environ["DATA_DIR"] = str(tmp_path)
-
         service = SearchService()
         service.get_or_create_index("test", temp_vault)
 
         service.close_all()
         assert len(service._indexes) == 0
 
+    def test_in_memory_index(self, temp_vault: Path, tmp_path: Path):
+        """Test that in-memory indexes search normally without touching disk."""
+        data_dir = tmp_path / "unused"
+        with patch.object(search_module.settings, "data_dir", data_dir):
+            service = SearchService(in_memory=True)
+            assert service.build_index("test", temp_vault) > 0
+            assert service.search("test", temp_vault, "callout")
+            service.close_all()
+
+        assert not data_dir.exists()
@@ -1,10 +1,13 @@
 """Tests for vault service."""
 
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from obsidian_reader.services.vault import VaultService
+from obsidian_reader.models.schemas import FileTreeItem, FileTreeResponse, NoteResponse
+from obsidian_reader.services.vault import SEARCH_CHUNK_SIZE, VaultService
 
 
 class TestVaultService:
@@ -26,6 +29,33 @@ class TestVaultService:
         count = service.get_note_count()
         assert count == 4  # test_note, Another Note, nested_note, note-with-dashes - test 1
 
+    def test_note_count_cached_until_invalidated(self, temp_vault: Path):
+        """Test that note counts are reused until invalidated."""
+        service = VaultService("test", temp_vault, "Test Vault")
+        assert service.get_note_count() == 4
+
+        (temp_vault / "Fresh.md").write_text("# Fresh")
+        assert service.get_note_count() == 4
+
+        service.invalidate_note_count()
+        assert service.get_note_count() == 5
+
+    def test_note_count_skips_hidden(self, temp_vault: Path):
+        """Test that notes in hidden folders are not counted, as in the tree."""
+        (temp_vault / ".trash").mkdir()
+        (temp_vault / ".trash" / "Deleted.md").write_text("# Deleted")
+
+        service = VaultService("test", temp_vault, "Test Vault")
+        assert service.get_note_count() == 4
+        assert ".trash" not in [item.name for item in service.build_file_tree()]
+
+    def test_note_count_skips_symlinked_folders(self, temp_vault: Path):
+        """Test that the note walk doesn't descend into symlinked folders."""
+        (temp_vault / "loop").symlink_to(temp_vault, target_is_directory=True)
+
+        service = VaultService("test", temp_vault, "Test Vault")
+        assert service.get_note_count() == 4
+
     def test_build_file_tree(self, temp_vault: Path):
         """Test building file tree."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -42,6 +72,17 @@ class TestVaultService:
         assert "Another Note" in file_names
         assert "subfolder" in folder_names
 
+    def test_build_file_tree_matches_validated_models(self, temp_vault: Path):
+        """Test that the unvalidated tree is equivalent to a validated one."""
+        service = VaultService("test", temp_vault, "Test Vault")
+        tree = service.build_file_tree()
+
+        for item in tree:
+            dumped = item.model_dump()
+            assert FileTreeItem.model_validate(dumped).model_dump() == dumped
+        response = FileTreeResponse(vault_id="test", tree=tree).model_dump_json()
+        assert FileTreeResponse.model_validate_json(response).tree == tree
+
     def test_get_note(self, temp_vault: Path):
         """Test getting a specific note."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -53,6 +94,15 @@ class TestVaultService:
         assert "example" in note.tags
         assert "inline-tag" in note.tags
 
+    def test_get_note_matches_validated_model(self, temp_vault: Path):
+        """Test that the unvalidated note is equivalent to a validated one."""
+        service = VaultService("test", temp_vault, "Test Vault")
+        note = service.get_note("Another Note")
+
+        assert note is not None
+        assert note.backlinks
+        assert NoteResponse.model_validate(note.model_dump()) == note
+
     def test_get_note_with_md_extension(self, temp_vault: Path):
         """Test getting a note with .md extension in path."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -76,6 +126,31 @@ class TestVaultService:
         assert note is not None
         assert "Nested Note" in note.content_html
 
+    def test_get_note_reuses_parsed_note(self, temp_vault: Path):
+        """Test that notes are parsed once until their file changes."""
+        service = VaultService("test", temp_vault, "Test Vault")
+        first = service.get_note("test_note")
+        assert first is not None
+
+        with patch("obsidian_reader.services.vault.frontmatter.load") as load:
+            again = service.get_note("test_note")
+        load.assert_not_called()
+        assert again == first
+
+        # Editing the note bumps its mtime and invalidates the cached parse
+        note_file = temp_vault / "test_note.md"
+        note_file.write_text("---\ntitle: Edited\n---\n\nNew body")
+        stat = note_file.stat()
+        os.utime(note_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        edited = service.get_note("test_note")
+        assert edited is not None
+        assert edited.title == "Edited"
+        assert edited.content_html == "New body"
+
+        service.clear_note_cache()
+        assert len(service._note_cache) == 0
+
     def test_backlinks(self, temp_vault: Path):
         """Test finding backlinks to a note."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -86,6 +161,58 @@ class TestVaultService:
         backlink_paths = [b.path for b in note.backlinks]
         assert "Another Note" in backlink_paths
 
+        # A second lookup is served from the index without re-reading notes
+        with patch.object(service, "_index_backlink_source") as index_source:
+            again = service.get_note("test_note")
+        index_source.assert_not_called()
+        assert again is not None
+        assert [b.path for b in again.backlinks] == backlink_paths
+
+    def test_backlinks_link_forms(self, temp_vault: Path):
+        """Test backlinks match full paths, headings and aliases but not prefixes."""
+        (temp_vault / "Heading Link.md").write_text("See [[subfolder/nested_note#Intro]].")
+        (temp_vault / "Alias Link.md").write_text("See [[ nested_note | the nested one]].")
+        (temp_vault / "Prefix Link.md").write_text("See [[nested_note_other]].")
+
+        service = VaultService("test", temp_vault, "Test Vault")
+        note = service.get_note("subfolder/nested_note")
+
+        assert note is not None
+        backlink_paths = sorted(b.path for b in note.backlinks)
+        assert backlink_paths == ["Alias Link", "Heading Link"]
+
+    def test_backlink_info_shared_across_targets(self, temp_vault: Path):
+        """Test that one source note yields the same BacklinkInfo for every target."""
+        (temp_vault / "Hub.md").write_text("Links to [[test_note]] and [[Another Note]].")
+        service = VaultService("test", temp_vault, "Test Vault")
+
+        first = service.get_note("test_note")
+        second = service.get_note("Another Note")
+
+        assert first is not None and second is not None
+        hub_first = next(b for b in first.backlinks if b.path == "Hub")
+        hub_second = next(b for b in second.backlinks if b.path == "Hub")
+        assert hub_first is hub_second
+
+    def test_backlink_index_tracks_file_changes(self, temp_vault: Path):
+        """Test that the backlink index picks up edited, added and removed notes."""
+        service = VaultService("test", temp_vault, "Test Vault")
+        assert [b.path for b in service.get_note("test_note").backlinks] == ["Another Note"]
+
+        # Edit: drop the link and bump the mtime so the change is detected
+        another = temp_vault / "Another Note.md"
+        another.write_text("No links here anymore.")
+        stat = another.stat()
+        os.utime(another, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        # Add: a new note linking by full path
+        (temp_vault / "New Note.md").write_text("Back to [[test_note|home]].")
+
+        assert [b.path for b in service.get_note("test_note").backlinks] == ["New Note"]
+
+        # Remove
+        (temp_vault / "New Note.md").unlink()
+        assert service.get_note("test_note").backlinks == []
+
     def test_get_attachment_path(self, temp_vault: Path):
         """Test getting attachment path."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -112,6 +239,18 @@ class TestVaultService:
         attachment = service.get_attachment_path("../../../etc/passwd")
         assert attachment is None
 
+    def test_path_traversal_into_sibling_with_shared_prefix(self, temp_vault: Path):
+        """Test that a sibling directory whose name extends the vault's is rejected."""
+        sibling = temp_vault.parent / f"{temp_vault.name}-private"
+        sibling.mkdir()
+        (sibling / "secret.md").write_text("# Secret")
+
+        service = VaultService("test", temp_vault, "Test Vault")
+        assert service.get_note(f"../{sibling.name}/secret") is None
+        assert service.get_attachment_path(f"../{sibling.name}/secret.md") is None
+        # Paths that only pass through a parent segment stay allowed
+        assert service.get_attachment_path("subfolder/../attachments/test.png") is not None
+
     def test_search_content(self, temp_vault: Path):
         """Test basic content search."""
         service = VaultService("test", temp_vault, "Test Vault")
@@ -120,3 +259,30 @@ class TestVaultService:
         assert len(results) == 1
         assert results[0][0] == "test_note"  # path
 
+    def test_search_content_case_insensitive(self, temp_vault: Path):
+        """Test content search ignores case, including non-ASCII letters."""
+        (temp_vault / "Umlaut.md").write_text("Notizen über Ärger und Öl.", encoding="utf-8")
+        service = VaultService("test", temp_vault, "Test Vault")
+
+        results = service.search_content("CALLOUT")
+        assert [r[0] for r in results] == ["test_note"]
+
+        results = service.search_content("ärger")
+        assert len(results) == 1
+        path, title, snippet = results[0]
+        assert path == "Umlaut"
+        assert "Ärger" in snippet
+
+    def test_search_content_match_across_chunk_boundary(self, temp_vault: Path):
+        """Test streaming search finds matches split between read chunks."""
+        filler = "x" * (SEARCH_CHUNK_SIZE - 4)
+        (temp_vault / "Large.md").write_text(f"{filler}Boundary marker{filler}")
+        service = VaultService("test", temp_vault, "Test Vault")
+
+        results = service.search_content("boundary marker")
+
+        assert len(results) == 1
+        path, _, snippet = results[0]
+        assert path == "Large"
+        assert "Boundary marker" in snippet
+        assert snippet.startswith("...") and snippet.endswith("...")
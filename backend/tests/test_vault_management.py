@@ -1,7 +1,10 @@
 """Tests for vault management functionality."""
 
+import dataclasses
 import json
 import os
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -13,6 +16,24 @@ os.environ["ENV"] = "development"
 os.environ["SECRET_KEY"] = "test_secret_key_for_testing_purposes_only"
 
 
+def _register_vault(manager, vault_id: str, vault_path: Path, loaded: bool = True):
+    """Add a vault to a manager's configuration and entries as initialize() would."""
+    from obsidian_reader.services.vault import VaultService
+    from obsidian_reader.services.vault_manager import (
+        VaultConfig,
+        VaultEntry,
+        VaultsConfiguration,
+    )
+
+    if manager._config is None:
+        manager._config = VaultsConfiguration(vaults={})
+    config = VaultConfig(path=str(vault_path), name=vault_id.title())
+    manager._config.vaults[vault_id] = config
+    service = VaultService(vault_id, vault_path, config.name) if loaded else None
+    manager._entries[vault_id] = VaultEntry(config, service)
+    return service
+
+
 class TestTokenEncryption:
     """Tests for token encryption/decryption."""
 
@@ -31,6 +52,37 @@ class TestTokenEncryption:
         decrypted = decrypt_token(encrypted)
         assert decrypted == original_token
 
+    def test_decrypt_is_cached_per_secret_key(self):
+        """Test that repeated decryption is memoized and tied to the secret key."""
+        from obsidian_reader.core import security
+        from obsidian_reader.core.security import decrypt_token, encrypt_token
+
+        encrypted = encrypt_token("ghp_cached")
+        security._decrypt_cached.cache_clear()
+
+        assert decrypt_token(encrypted) == "ghp_cached"
+        assert decrypt_token(encrypted) == "ghp_cached"
+        info = security._decrypt_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+        # A different secret key must not reuse the cached plaintext
+        with patch.object(security.settings, "secret_key", "another_secret"):
+            assert decrypt_token(encrypted) is None
+
+    def test_fernet_reused_per_secret_key(self):
+        """Test that the Fernet instance is built once per secret key."""
+        from obsidian_reader.core import security
+
+        security._get_fernet.cache_clear()
+        security._decrypt_cached.cache_clear()
+
+        encrypted = security.encrypt_token("ghp_one")
+        security.encrypt_token("ghp_two")
+        assert security.decrypt_token(encrypted) == "ghp_one"
+
+        info = security._get_fernet.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
     def test_encrypt_empty_token(self):
         """Test encrypting an empty token."""
         from obsidian_reader.core.security import encrypt_token
@@ -144,6 +196,81 @@ class TestVaultManagerConfig:
         assert config.encrypted_token is None
         assert config.refresh_interval_minutes is None
 
+    def test_vault_config_path_obj(self):
+        """Test that the parsed Path is cached and kept out of serialization."""
+        from obsidian_reader.services.vault_manager import VaultConfig
+
+        config = VaultConfig(path="/path/to/vault", name="My Vault")
+
+        assert config.path_obj == Path("/path/to/vault")
+        assert config.path_obj is config.path_obj
+        assert dataclasses.asdict(config) == {
+            "path": "/path/to/vault",
+            "name": "My Vault",
+            "repo_url": None,
+            "encrypted_token": None,
+            "refresh_interval_minutes": None,
+        }
+        assert config == VaultConfig(path="/path/to/vault", name="My Vault")
+
+    def test_vault_config_is_slotted(self):
+        """Test that VaultConfig is a slotted dataclass without an instance dict."""
+        from obsidian_reader.services.vault_manager import VaultConfig, VaultsConfiguration
+
+        config = VaultConfig(path="/path/to/vault", name="My Vault")
+
+        assert VaultConfig.__slots__
+        assert not hasattr(config, "__dict__")
+        # The cached path stays out of the serialized configuration
+        config.path_obj
+        dumped = VaultsConfiguration(vaults={"v": config}).model_dump()
+        assert dumped["vaults"]["v"] == dataclasses.asdict(config)
+
+
+class TestVaultConfigurationLoading:
+    """Tests for building the vault configuration from parsed JSON."""
+
+    def test_trusted_config_matches_validated(self):
+        """Test the unvalidated fast path builds the same models as validation."""
+        from obsidian_reader.services.vault_manager import (
+            VaultsConfiguration,
+            _load_configuration,
+        )
+
+        config_data = {
+            "vaults": {
+                "a": {"path": "/vaults/a", "name": "A"},
+                "b": {
+                    "path": "/vaults/b",
+                    "name": "B",
+                    "repo_url": "https://github.com/user/b",
+                    "encrypted_token": "gAAAA",
+                    "refresh_interval_minutes": 30,
+                },
+            },
+            "default_vault": "a",
+        }
+
+        loaded = _load_configuration(config_data)
+
+        assert loaded == VaultsConfiguration.model_validate(config_data)
+
+    def test_untrusted_config_is_validated(self):
+        """Test that entries with unexpected types go through full validation."""
+        from pydantic import ValidationError
+
+        from obsidian_reader.services.vault_manager import _load_configuration
+
+        # Coercible value: validated and converted
+        loaded = _load_configuration(
+            {"vaults": {"a": {"path": "/a", "name": "A", "refresh_interval_minutes": "15"}}}
+        )
+        assert loaded.vaults["a"].refresh_interval_minutes == 15
+
+        # Missing required field: rejected
+        with pytest.raises(ValidationError):
+            _load_configuration({"vaults": {"a": {"name": "A"}}})
+
 
 class TestVaultManagerOperations:
     """Tests for VaultManager vault operations."""
@@ -167,6 +294,7 @@ class TestVaultManagerOperations:
         with patch("obsidian_reader.services.vault_manager.settings") as mock_settings:
             mock_settings.vaults_config = config_path
             mock_settings.vaults_dir = vaults_dir
+            mock_settings.max_sessions = 100
 
             from obsidian_reader.services.vault_manager import VaultManager
 
@@ -195,6 +323,331 @@ class TestVaultManagerOperations:
         vault_id = manager._generate_vault_id("My Vault")
         assert vault_id == "my-vault-1"
 
+    def test_generate_vault_id_skips_loaded_and_configured(self, vault_manager_setup):
+        """Test that IDs used by either loaded or configured vaults are skipped."""
+        manager, _ = vault_manager_setup
+        manager._config = MagicMock()
+        manager._config.vaults = {"my-vault": MagicMock(), "my-vault-1": MagicMock()}
+        manager._entries = {"my-vault-2": MagicMock()}
+
+        assert manager._generate_vault_id("My Vault!") == "my-vault-3"
+
+    def test_save_config_roundtrip(self, vault_manager_setup):
+        """Test that a saved configuration loads back unchanged."""
+        from obsidian_reader.services.vault_manager import (
+            VaultConfig,
+            VaultsConfiguration,
+            _load_configuration,
+        )
+
+        manager, tmp_path = vault_manager_setup
+        manager._config = VaultsConfiguration(
+            vaults={
+                "notes": VaultConfig(
+                    path="/vaults/notes",
+                    name="Notes ✓",
+                    repo_url="https://github.com/user/notes",
+                    encrypted_token="gAAAA",
+                    refresh_interval_minutes=15,
+                )
+            },
+            default_vault="notes",
+        )
+
+        manager._save_config()
+
+        saved = json.loads((tmp_path / "vaults.json").read_text(encoding="utf-8"))
+        assert _load_configuration(saved) == manager._config
+        # The temp file used for the atomic swap doesn't linger
+        assert not (tmp_path / "vaults.json.tmp").exists()
+
+    def test_save_config_falls_back_when_replace_fails(self, vault_manager_setup):
+        """Test saving still works where the config file can't be renamed over."""
+        from obsidian_reader.services.vault_manager import VaultsConfiguration
+
+        manager, tmp_path = vault_manager_setup
+        manager._config = VaultsConfiguration(vaults={}, default_vault=None)
+
+        with patch("obsidian_reader.services.vault_manager.os.replace", side_effect=OSError):
+            manager._save_config()
+
+        assert json.loads((tmp_path / "vaults.json").read_text()) == {
+            "vaults": {},
+            "default_vault": None,
+        }
+        assert not (tmp_path / "vaults.json.tmp").exists()
+
+    def test_save_config_concurrent_threads(self, vault_manager_setup):
+        """Test that saves from several threads never interleave their writes."""
+        from obsidian_reader.services import vault_manager as vm_module
+        from obsidian_reader.services.vault_manager import (
+            VaultConfig,
+            VaultsConfiguration,
+            _load_configuration,
+        )
+
+        manager, tmp_path = vault_manager_setup
+        manager._config = VaultsConfiguration(
+            vaults={"notes": VaultConfig(path="/vaults/notes", name="Notes")},
+            default_vault="notes",
+        )
+
+        active = 0
+        overlapped = False
+        real_replace = os.replace
+
+        def tracking_replace(src, dst):
+            nonlocal active, overlapped
+            active += 1
+            overlapped = overlapped or active > 1
+            time.sleep(0.001)
+            real_replace(src, dst)
+            active -= 1
+
+        with patch.object(vm_module.os, "replace", side_effect=tracking_replace):
+            threads = [
+                threading.Thread(target=lambda: [manager._save_config() for _ in range(10)])
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert not overlapped
+        saved = json.loads((tmp_path / "vaults.json").read_text(encoding="utf-8"))
+        assert _load_configuration(saved) == manager._config
+        assert not (tmp_path / "vaults.json.tmp").exists()
+
+    def test_list_vaults_counts_notes_per_vault(self, vault_manager_setup):
+        """Test that concurrently computed note counts map to the right vaults."""
+        from obsidian_reader.models.schemas import VaultInfo
+
+        manager, tmp_path = vault_manager_setup
+        for vault_id, notes in (("one", 1), ("two", 2), ("three", 3)):
+            vault_path = tmp_path / vault_id
+            vault_path.mkdir()
+            for i in range(notes):
+                (vault_path / f"note{i}.md").write_text("# Note")
+            _register_vault(manager, vault_id, vault_path)
+        _register_vault(manager, "missing", tmp_path / "missing", loaded=False)
+
+        vaults = manager.list_vaults()
+
+        assert [(v.id, v.note_count) for v in vaults] == [("one", 1), ("two", 2), ("three", 3)]
+        for vault in vaults:
+            assert VaultInfo.model_validate(vault.model_dump()) == vault
+
+    async def test_list_vaults_cached_until_invalidated(self, vault_manager_setup):
+        """Test that the vault list is reused until a vault is added or removed."""
+        manager, tmp_path = vault_manager_setup
+        vault_path = tmp_path / "cached"
+        vault_path.mkdir()
+        _register_vault(manager, "cached", vault_path)
+
+        first = manager.list_vaults()
+        first.clear()
+        assert [v.id for v in manager.list_vaults()] == ["cached"]
+
+        await manager.delete_vault("cached", delete_files=False)
+
+        assert manager.list_vaults() == []
+
+    def test_session_limit_defaults_to_settings(self, vault_manager_setup):
+        """Test that the session cap comes from settings when not given."""
+        from obsidian_reader.services.vault_manager import VaultManager, settings
+
+        settings.max_sessions = 3
+        manager = VaultManager()
+
+        assert manager._session_vaults.maxsize == 3
+
+    def test_session_vaults_are_bounded(self):
+        """Test that least recently used session mappings are evicted."""
+        from obsidian_reader.services.vault_manager import VaultEntry, VaultManager
+
+        manager = VaultManager(max_sessions=2)
+        manager._entries = {
+            "a": VaultEntry(MagicMock(), MagicMock()),
+            "b": VaultEntry(MagicMock(), MagicMock()),
+        }
+
+        assert manager.set_active_vault("s1", "a")
+        assert manager.set_active_vault("s2", "b")
+        # Touch s1 so s2 becomes the least recently used session
+        assert manager.get_active_vault_id("s1") == "a"
+        assert manager.set_active_vault("s3", "b")
+
+        assert len(manager._session_vaults) == 2
+        assert "s1" in manager._session_vaults
+        assert "s2" not in manager._session_vaults
+
+    def test_session_vaults_indexed_by_vault(self):
+        """Test that the vault -> sessions index follows updates and evictions."""
+        from obsidian_reader.services.vault_manager import VaultEntry, VaultManager
+
+        manager = VaultManager(max_sessions=2)
+        manager._entries = {
+            "a": VaultEntry(MagicMock(), MagicMock()),
+            "b": VaultEntry(MagicMock(), MagicMock()),
+        }
+
+        manager.set_active_vault("s1", "a")
+        manager.set_active_vault("s2", "a")
+        manager.set_active_vault("s2", "b")
+        assert dict(manager._session_vaults.sessions_by_vault) == {"a": {"s1"}, "b": {"s2"}}
+
+        # Evicting s1 also drops it from the index
+        manager.set_active_vault("s3", "b")
+        assert dict(manager._session_vaults.sessions_by_vault) == {"b": {"s2", "s3"}}
+
+        manager._session_vaults.clear()
+        assert not manager._session_vaults.sessions_by_vault
+
+    async def test_delete_vault_drops_cached_session_vault(self, vault_manager_setup):
+        """Test that a session never resolves to a deleted vault's cached service."""
+        from obsidian_reader.services.vault_manager import VaultManager
+
+        _, tmp_path = vault_manager_setup
+        manager = VaultManager(max_sessions=2)
+        _register_vault(manager, "a", tmp_path / "vaults" / "a")
+        kept = _register_vault(manager, "b", tmp_path / "vaults" / "b")
+
+        assert manager.set_active_vault("s1", "a")
+        assert manager.set_active_vault("s2", "b")
+        assert manager.get_active_vault("s1") is not None
+        # Evicts s1's mapping, and its cached service along with it
+        assert manager.set_active_vault("s3", "b")
+
+        assert await manager.delete_vault("a")
+
+        assert manager.get_active_vault("s1") is kept
+        assert manager.get_active_vault_id("s1") == "b"
+
+    async def test_delete_vault_removes_files(self, vault_manager_setup):
+        """Test that deleting a vault removes its whole directory tree."""
+        manager, tmp_path = vault_manager_setup
+        vault_path = tmp_path / "vaults" / "doomed"
+        for folder in ("a", "b/c", ".git/objects"):
+            (vault_path / folder).mkdir(parents=True)
+            (vault_path / folder / "note.md").write_text("# Note")
+        (vault_path / "root.md").write_text("# Root")
+        (vault_path / "link").symlink_to(tmp_path / "vaults")
+        _register_vault(manager, "doomed", vault_path)
+
+        assert await manager.delete_vault("doomed")
+
+        assert not vault_path.exists()
+        # The symlink is removed without following it
+        assert (tmp_path / "vaults").is_dir()
+        assert "doomed" not in manager.get_config().vaults
+
+    async def test_delete_vault_keeps_symlink_target(self, vault_manager_setup):
+        """Test that deleting a vault whose path is a symlink leaves the target intact."""
+        manager, tmp_path = vault_manager_setup
+        target = tmp_path / "real_notes"
+        (target / "folder").mkdir(parents=True)
+        (target / "folder" / "note.md").write_text("# Note")
+        (target / "root.md").write_text("# Root")
+        vault_path = tmp_path / "vaults" / "linked"
+        vault_path.symlink_to(target)
+        _register_vault(manager, "linked", vault_path)
+
+        assert await manager.delete_vault("linked")
+
+        assert (target / "root.md").read_text() == "# Root"
+        assert (target / "folder" / "note.md").exists()
+        assert "linked" not in manager.get_config().vaults
+
+    async def test_batch_defers_config_save(self, vault_manager_setup):
+        """Test that saves inside nested batches are written once on exit."""
+        import orjson
+
+        manager, tmp_path = vault_manager_setup
+        for vault_id in ("a", "b", "c"):
+            _register_vault(manager, vault_id, tmp_path / vault_id, loaded=False)
+
+        with patch(
+            "obsidian_reader.services.vault_manager.orjson.dumps", wraps=orjson.dumps
+        ) as dumps:
+            async with manager.batch():
+                await manager.delete_vault("a", delete_files=False)
+                async with manager.batch():
+                    await manager.delete_vault("b", delete_files=False)
+                assert dumps.call_count == 0
+
+            assert dumps.call_count == 1
+
+        saved = json.loads((tmp_path / "vaults.json").read_text())
+        assert list(saved["vaults"]) == ["c"]
+
+    async def test_active_vault_cache_cleared_on_delete(self, vault_manager_setup):
+        """Test that cached session vault services don't outlive their vault."""
+        manager, tmp_path = vault_manager_setup
+        services = {}
+        for vault_id in ("a", "b"):
+            (tmp_path / vault_id).mkdir()
+            services[vault_id] = _register_vault(manager, vault_id, tmp_path / vault_id)
+        manager._config.default_vault = manager._default_vault = "a"
+
+        assert manager.set_active_vault("session", "b")
+        assert manager.get_active_vault("session") is services["b"]
+
+        await manager.delete_vault("b", delete_files=False)
+
+        assert manager.get_active_vault("session") is services["a"]
+
+    async def test_initialize_skips_missing_vaults(self, vault_manager_setup):
+        """Test that only vaults whose paths exist are loaded."""
+        manager, tmp_path = vault_manager_setup
+        (tmp_path / "present").mkdir()
+        config_data = {
+            "vaults": {
+                "present": {"path": str(tmp_path / "present"), "name": "Present"},
+                "missing": {"path": str(tmp_path / "missing"), "name": "Missing"},
+            },
+            "default_vault": "present",
+        }
+        (tmp_path / "vaults.json").write_text(json.dumps(config_data))
+
+        with patch.object(manager, "_schedule_vault_syncs"):
+            await manager.initialize()
+
+        assert manager.get_vault("present") is not None
+        assert manager.get_vault("missing") is None
+        assert manager.get_default_vault() == "present"
+        # Unloaded vaults stay configured and can still be inspected or deleted
+        assert manager.get_vault_sync_info("missing") is not None
+        assert [v.id for v in manager.list_vaults()] == ["present"]
+
+    async def test_initialize_invalid_json(self, vault_manager_setup):
+        """Test that a malformed config file falls back to an empty configuration."""
+        manager, tmp_path = vault_manager_setup
+        (tmp_path / "vaults.json").write_text("{not valid json")
+
+        await manager.initialize()
+
+        config = manager.get_config()
+        assert config is not None
+        assert config.vaults == {}
+        assert manager.list_vaults() == []
+
+    async def test_initialize_and_save_with_directory_config_path(self, vault_manager_setup):
+        """Test that a config path mounted as a directory is replaced on first save."""
+        manager, tmp_path = vault_manager_setup
+        config_path = tmp_path / "vaults.json"
+        config_path.unlink()
+        config_path.mkdir()
+
+        await manager.initialize()
+        assert manager.get_config().vaults == {}
+
+        manager._save_config()
+        manager._save_config()
+
+        assert config_path.is_file()
+        assert json.loads(config_path.read_text())["vaults"] == {}
+
 
 class TestScheduler:
     """Tests for vault scheduler."""
@@ -234,6 +687,22 @@ class TestScheduler:
         finally:
             scheduler.shutdown()
 
+    def test_scheduled_sync_updates_search_index(self):
+        """Test that a successful scheduled sync re-indexes the vault's changed notes."""
+        from obsidian_reader.services.scheduler import VaultScheduler
+
+        scheduler = VaultScheduler()
+        vault_path = Path("/tmp/test")
+
+        with patch("obsidian_reader.services.scheduler.search_service") as search_service:
+            with patch.object(scheduler, "_sync_vault", return_value={"success": False}):
+                scheduler._run_scheduled_sync("test-vault", vault_path, "encrypted123")
+            search_service.update_index.assert_not_called()
+
+            with patch.object(scheduler, "_sync_vault", return_value={"success": True}):
+                scheduler._run_scheduled_sync("test-vault", vault_path, "encrypted123")
+            search_service.update_index.assert_called_once_with("test-vault", vault_path)
+
     def test_scheduler_remove_job(self):
         """Test removing a sync job."""
         from obsidian_reader.services.scheduler import VaultScheduler